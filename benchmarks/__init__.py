@@ -0,0 +1,6 @@
+"""
+Micro- and macro-benchmarks for the chess engine.
+
+Run with ``poetry run python -m benchmarks``; use ``--help`` to see how to write results to JSON, save a baseline
+and compare against it.
+"""
@@ -0,0 +1,45 @@
+import argparse
+import sys
+
+from benchmarks import micro, macro, smp, ui
+from benchmarks.runner import DEFAULT_REPEATS, DEFAULT_THRESHOLD, compare, format_measurement, read_report, \
+    write_report
+
+SUITES = {'micro': micro, 'macro': macro, 'smp': smp, 'ui': ui}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks the chess engine.')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help='the benchmark suites to run: {} (default: all)'.format(', '.join(sorted(SUITES))))
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS, help='the number of timed runs per benchmark')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', help='compare the results against this JSON file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='the slowdown, as a fraction, counted as a regression (default: 0.1)')
+    args = parser.parse_args(argv)
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error('unknown suite: {}'.format(name))
+
+    baseline = read_report(args.baseline) if args.baseline else None
+    measurements = []
+    for name in args.suites or sorted(SUITES):
+        for measurement in SUITES[name].run(repeats=args.repeats):
+            print(format_measurement(measurement, baseline))
+            measurements.append(measurement)
+
+    if args.output:
+        write_report(measurements, args.output)
+
+    if baseline is not None:
+        regressions = compare(measurements, baseline, args.threshold)
+        for name, change in regressions:
+            print('REGRESSION: {} is {:.1f}% slower than the baseline'.format(name, -100 * change))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""
+Macro-benchmarks: perft and fixed-depth searches over the position corpus.
+"""
+
+from chessington.engine.bot import Bot
+from chessington.engine.moves import perft
+
+from benchmarks.positions import CORPUS, get_position
+from benchmarks.runner import measure
+
+PERFT_DEPTH = 2
+SEARCH_DEPTH = 3
+
+
+def run(**options):
+    options = dict(options, min_time=0)
+    measurements = []
+    for name in CORPUS:
+        board = get_position(name)
+        measurements.append(measure('perft({}) {}'.format(PERFT_DEPTH, name),
+                                    lambda _, board=board: perft(board, PERFT_DEPTH), **options))
+    for name in CORPUS:
+        board = get_position(name)
+        measurements.append(measure('search(depth={}) {}'.format(SEARCH_DEPTH, name),
+                                    lambda bot, board=board: bot.search(board, max_depth=SEARCH_DEPTH),
+                                    setup=Bot, **options))
+    return measurements
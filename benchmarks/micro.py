@@ -0,0 +1,50 @@
+"""
+Micro-benchmarks of the engine's basic operations.
+"""
+
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+from benchmarks.positions import get_position
+from benchmarks.runner import measure
+
+PIECE_SQUARES = {
+    Pawn: Square.at(1, 0),
+    Knight: Square.at(2, 5),
+    Bishop: Square.at(3, 2),
+    Rook: Square.at(0, 0),
+    Queen: Square.at(0, 3),
+    King: Square.at(0, 4)
+}
+
+
+def move_there_and_back(board):
+    """
+    Moves white's knight from f3 to h4 and back again, restoring the board's history and move counters, so that
+    every call starts from the same position.
+    """
+    hash_history, halfmove_clock = board.hash_history, board.halfmove_clock
+    board.move_piece(Square.at(2, 5), Square.at(3, 7))
+    board.current_player = Player.WHITE
+    board.move_piece(Square.at(3, 7), Square.at(2, 5))
+    board.current_player = Player.WHITE
+    board.hash_history, board.halfmove_clock = hash_history, halfmove_clock
+
+
+def run(**options):
+    board = get_position('open game')
+    measurements = []
+
+    for piece_type, square in PIECE_SQUARES.items():
+        piece = board.get_piece(square)
+        assert isinstance(piece, piece_type) and piece.player == Player.WHITE
+        measurements.append(measure('{}.get_available_moves'.format(piece_type.__name__),
+                                    lambda _, piece=piece: piece.get_available_moves(board), **options))
+
+    measurements.append(measure('Board.move_piece (there and back)', move_there_and_back, setup=board.clone,
+                                **options))
+
+    black_king = board.get_piece(Square.at(7, 4))
+    measurements.append(measure('Board.find_piece', lambda _: board.find_piece(black_king), **options))
+    measurements.append(measure('Square.at', lambda _: Square.at(3, 4), **options))
+    return measurements
@@ -0,0 +1,27 @@
+"""
+The fixed corpus of positions the benchmarks are run on, each reached by a sequence of moves from the start.
+"""
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move
+
+CORPUS = {
+    'start': [],
+    'open game': ['e2e4', 'e7e5', 'g1f3', 'b8c6', 'f1c4', 'f8c5'],
+    'queens gambit': ['d2d4', 'd7d5', 'c2c4', 'e7e6', 'b1c3', 'g8f6', 'c1g5', 'f8e7'],
+    'middlegame': ['e2e4', 'c7c5', 'g1f3', 'd7d6', 'd2d4', 'c5d4', 'f3d4', 'g8f6', 'b1c3', 'a7a6', 'c1e3', 'e7e5',
+                   'd4b3', 'c8e6', 'f2f3', 'f8e7', 'd1d2', 'b8d7'],
+    'endgame': ['e2e4', 'd7d5', 'e4d5', 'd8d5', 'b1c3', 'd5a5', 'd2d4', 'c7c6', 'g1f3', 'c8f5', 'f1c4', 'e7e6',
+                'c1d2', 'a5c7', 'd1e2', 'f8b4', 'c3e4', 'b4d2', 'e2d2', 'g8f6', 'e4f6', 'g7f6']
+}
+
+
+def get_position(name):
+    board = Board.at_starting_position()
+    for text in CORPUS[name]:
+        move = Move.from_uci(text)
+        piece = board.get_piece(move.from_square)
+        if piece is None or piece.player != board.current_player:
+            raise ValueError('Illegal move {} in benchmark position {}'.format(text, name))
+        board.move_piece(move.from_square, move.to_square)
+    return board
@@ -0,0 +1,95 @@
+"""
+Timing, reporting and baseline comparison shared by the micro- and macro-benchmarks.
+"""
+
+import json
+import platform
+import statistics
+import time
+from collections import namedtuple
+
+DEFAULT_REPEATS = 5
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_THRESHOLD = 0.1
+
+
+class Measurement(namedtuple('Measurement', 'name ops_per_sec stdev runs')):
+    """
+    The speed of one benchmark: the mean operations per second over several runs, its standard deviation, and the
+    operations per second of each run.
+    """
+
+    def to_json(self):
+        return {'ops_per_sec': self.ops_per_sec, 'stdev': self.stdev, 'runs': list(self.runs)}
+
+
+def measure(name, operation, setup=None, repeats=DEFAULT_REPEATS, min_time=DEFAULT_MIN_TIME):
+    """
+    Times how many times per second `operation` can be called. The number of calls per run is calibrated so that
+    each run takes at least `min_time` seconds. If `setup` is given, it is called before each run, and its result is
+    passed to `operation`.
+    """
+    argument = setup() if setup is not None else None
+    iterations = 1
+    while True:
+        elapsed = _time_run(operation, argument, iterations)
+        if elapsed >= min_time:
+            break
+        iterations *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    runs = []
+    for _ in range(repeats):
+        argument = setup() if setup is not None else None
+        runs.append(iterations / _time_run(operation, argument, iterations))
+    stdev = statistics.stdev(runs) if len(runs) > 1 else 0.0
+    return Measurement(name=name, ops_per_sec=statistics.mean(runs), stdev=stdev, runs=runs)
+
+
+def _time_run(operation, argument, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        operation(argument)
+    return time.perf_counter() - start
+
+
+def to_report(measurements):
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'benchmarks': {measurement.name: measurement.to_json() for measurement in measurements}
+    }
+
+
+def write_report(measurements, path):
+    with open(path, 'w') as report_file:
+        json.dump(to_report(measurements), report_file, indent=2)
+
+
+def read_report(path):
+    with open(path) as report_file:
+        return json.load(report_file)
+
+
+def compare(measurements, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares measurements against a baseline report, returning a list of (name, change) pairs for every benchmark
+    that has slowed down by more than `threshold` (as a fraction of the baseline speed).
+    """
+    regressions = []
+    for measurement in measurements:
+        previous = baseline['benchmarks'].get(measurement.name)
+        if previous is None:
+            continue
+        change = measurement.ops_per_sec / previous['ops_per_sec'] - 1
+        if change < -threshold:
+            regressions.append((measurement.name, change))
+    return regressions
+
+
+def format_measurement(measurement, baseline=None):
+    line = '{:<45} {:>14,.1f} ops/sec  +/- {:>5.1f}%'.format(
+        measurement.name, measurement.ops_per_sec, 100 * measurement.stdev / measurement.ops_per_sec)
+    previous = baseline['benchmarks'].get(measurement.name) if baseline is not None else None
+    if previous is not None:
+        line += '  ({:+.1f}% vs baseline)'.format(100 * (measurement.ops_per_sec / previous['ops_per_sec'] - 1))
+    return line
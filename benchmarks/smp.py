@@ -0,0 +1,32 @@
+"""
+Lazy SMP benchmarks: the time a fixed-depth search takes with and without helper processes. Each search starts
+from an empty transposition table, so the speed is that of reaching the depth from scratch.
+"""
+
+from chessington.engine.bot import Bot
+
+from benchmarks.positions import CORPUS, get_position
+from benchmarks.runner import measure
+
+SEARCH_DEPTH = 4
+HELPER_COUNTS = (0, 2)
+
+
+def search_from_scratch(bot, board):
+    bot.table.clear()
+    bot.search(board, max_depth=SEARCH_DEPTH)
+
+
+def run(**options):
+    options = dict(options, min_time=0)
+    measurements = []
+    for helpers in HELPER_COUNTS:
+        bot = Bot(helpers=helpers)
+        try:
+            for name in CORPUS:
+                board = get_position(name)
+                measurements.append(measure('search(depth={}, helpers={}) {}'.format(SEARCH_DEPTH, helpers, name),
+                                            lambda _, board=board: search_from_scratch(bot, board), **options))
+        finally:
+            bot.close()
+    return measurements
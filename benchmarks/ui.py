@@ -0,0 +1,107 @@
+"""
+UI benchmarks: redrawing the board after each move of a game, through a stub window, both with `BoardView`, which
+only updates the buttons that have changed, and by updating every button as the board used to be redrawn. The stub's
+updates cost almost nothing, where a real window's cost far more, so these measure the cost of working out what to
+update; `count_updates` gives the number of updates each way makes.
+"""
+
+from chessington.engine.board import Board, BOARD_SIZE
+from chessington.engine.data import Move, Square
+from chessington.ui.board_view import BoardView, FROM_SQUARE_COLOUR, TO_SQUARE_COLOUR, get_image_data_from_piece, \
+    get_key_from_square, get_square_colour
+
+from benchmarks.positions import CORPUS
+from benchmarks.runner import measure
+
+GAME = 'middlegame'
+
+
+class StubElement:
+    """
+    Stands in for a button on the board, counting the updates made to it in its window.
+    """
+
+    def __init__(self, window):
+        self.window = window
+
+    def Update(self, **changes):
+        self.window.updates += 1
+
+
+class StubWindow:
+    """
+    Stands in for a PySimpleGUI window, with a button for each square of the board.
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.elements = {}
+
+    def FindElement(self, key):
+        element = self.elements.get(key)
+        if element is None:
+            element = self.elements[key] = StubElement(self)
+        return element
+
+
+def get_frames(name=GAME):
+    """
+    The frames shown while a game from the corpus is played, as (board, from_square, to_squares): each position, with
+    the move about to be played from it highlighted, and then the final position.
+    """
+    board = Board.at_starting_position()
+    frames = []
+    for text in CORPUS[name]:
+        move = Move.from_uci(text)
+        frames.append((board.clone(), move.from_square, [move.to_square]))
+        board.move_piece(move.from_square, move.to_square)
+    frames.append((board, None, []))
+    return frames
+
+
+def redraw_in_full(window, board, from_square, to_squares):
+    """
+    Redraws the board by updating the image and colour of every button, and then highlighting the squares.
+    """
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            square = Square.at(row, col)
+            element = window.FindElement(key=get_key_from_square(square))
+            element.Update(image_data=get_image_data_from_piece(board.get_piece(square)))
+            element.Update(button_color=('white', get_square_colour(square)))
+    if from_square is not None:
+        window.FindElement(key=get_key_from_square(from_square)).Update(button_color=('white', FROM_SQUARE_COLOUR))
+    for square in to_squares:
+        window.FindElement(key=get_key_from_square(square)).Update(button_color=('white', TO_SQUARE_COLOUR))
+
+
+def redraw_changes(view, frames):
+    for board, from_square, to_squares in frames:
+        view.redraw(board, from_square, to_squares)
+
+
+def redraw_everything(window, frames):
+    for board, from_square, to_squares in frames:
+        redraw_in_full(window, board, from_square, to_squares)
+
+
+def count_updates(frames):
+    """
+    The number of button updates made by redrawing each frame in turn, with `BoardView` and in full.
+    """
+    window = StubWindow()
+    redraw_changes(BoardView(window, frames[0][0]), frames)
+    changes = window.updates
+    window = StubWindow()
+    redraw_everything(window, frames)
+    return changes, window.updates
+
+
+def run(**options):
+    frames = get_frames()
+    window = StubWindow()
+    view = BoardView(window, frames[0][0])
+    return [
+        measure('BoardView.redraw ({} frames)'.format(len(frames)), lambda _: redraw_changes(view, frames), **options),
+        measure('full redraw ({} frames)'.format(len(frames)), lambda _: redraw_everything(window, frames), **options)
+    ]
@@ -0,0 +1,301 @@
+"""
+A pipeline which plays or replays games, samples positions from them and scores each one with the bot, writing the
+positions, scores and game results out in fixed-size NumPy shards, for tuning the evaluation offline.
+
+Games are played (or replayed from a self-play .jsonl file) and scored across a pool of worker processes. Games to
+play and scored positions pass through bounded queues, so memory use stays flat however long the run is. Run with
+``poetry run chessington-dataset --help`` for the available options.
+
+NumPy is an optional dependency: install it with ``poetry install -E numpy``.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import random
+import threading
+import traceback
+from collections import namedtuple
+
+import numpy as np
+
+from chessington.engine.batch import board_to_tensor, NUMBER_OF_PLANES, NUMBER_OF_SQUARES
+from chessington.engine.board import Board
+from chessington.engine.bot import Bot, TimeManager
+from chessington.engine.data import Player, Move
+from chessington.selfplay import get_result, WHITE_WINS, BLACK_WINS, DRAW
+
+DEFAULT_SHARD_SIZE = 4096
+DEFAULT_QUEUE_SIZE = 16
+SHARD_NAME = 'shard-{:05d}.npz'
+PACKED_SQUARES = NUMBER_OF_SQUARES // 8
+RESULT_VALUES = {WHITE_WINS: 1, BLACK_WINS: -1, DRAW: 0}
+
+
+class DatasetSettings(namedtuple('DatasetSettings', 'depth node_budget play_depth sample_rate random_plies max_plies')):
+    """
+    Everything a worker process needs to know to play and score games: the depth (and optionally the number of
+    nodes) to score positions to, the depth to play games at, the share of positions to sample, how many random
+    moves to open each played game with, and the number of plies after which a game is scored as a draw.
+    """
+    pass
+
+
+class GameTask(namedtuple('GameTask', 'game_id seed moves result')):
+    """
+    One game to sample positions from. If `moves` is None, the game is played by the bot; otherwise it is replayed
+    from its moves in long algebraic notation, and `result` is its PGN result.
+    """
+    pass
+
+
+class Sample(namedtuple('Sample', 'board side_to_move score result game_id ply')):
+    """
+    A scored position: the board as packed piece planes (see `pack_board`), 1 if white is to move or -1 if black
+    is, the bot's score in centipawns from the point of view of the player to move, the result of the game from
+    white's point of view (1, 0 or -1), and where in which game the position came from.
+    """
+    pass
+
+
+def pack_board(board):
+    """
+    Converts a board into its (12, 64) piece planes (see `board_to_tensor`), packed eight squares to a byte into a
+    (12, 8) array of uint8.
+    """
+    return np.packbits(board_to_tensor(board, dtype=np.uint8), axis=-1)
+
+
+def unpack_boards(packed):
+    """
+    Unpacks boards packed by `pack_board`, of shape (..., 12, 8), into piece planes of shape (..., 12, 64).
+    """
+    return np.unpackbits(packed, axis=-1)
+
+
+def play_moves(settings, generator):
+    """
+    Plays a game, opening with `random_plies` random moves and then letting the bot play at `play_depth`. Returns
+    the moves played and the result.
+    """
+    board = Board.at_starting_position()
+    bot = Bot(max_depth=settings.play_depth)
+    moves = []
+    while True:
+        state = board.game_state()
+        if state.is_over():
+            return moves, get_result(board, state)
+        if len(moves) >= settings.max_plies:
+            return moves, DRAW
+
+        if len(moves) < settings.random_plies:
+            available_moves = Bot.generate_legal_moves(board)
+            move = generator.choice(available_moves) if available_moves else None
+        else:
+            move = bot.search(board, max_depth=settings.play_depth).move
+        if move is None:
+            return moves, DRAW
+
+        board.move_piece(move.from_square, move.to_square)
+        moves.append(move)
+
+
+def sample_game(task, settings):
+    """
+    Plays or replays a game, and scores a random sample of the positions in it, returning a list of samples.
+    """
+    generator = random.Random(task.seed)
+    if task.moves is None:
+        moves, result = play_moves(settings, generator)
+    else:
+        moves, result = [Move.from_uci(text) for text in task.moves], task.result
+
+    scorer = Bot(max_depth=settings.depth)
+    board = Board.at_starting_position()
+    samples = []
+    for ply in range(len(moves) + 1):
+        if generator.random() < settings.sample_rate and not board.game_state().is_over():
+            time_manager = TimeManager(node_budget=settings.node_budget)
+            search = scorer.search(board, time_manager, max_depth=settings.depth)
+            if search.depth == 0:
+                # The node budget ran out before the first depth was finished, which leaves no score, so score the
+                # position to depth 1 instead, whatever that costs
+                search = scorer.search(board, max_depth=1)
+            samples.append(Sample(board=pack_board(board),
+                                  side_to_move=1 if board.current_player == Player.WHITE else -1,
+                                  score=search.score, result=RESULT_VALUES[result], game_id=task.game_id, ply=ply))
+        if ply < len(moves):
+            board.move_piece(moves[ply].from_square, moves[ply].to_square)
+    return samples
+
+
+class ShardWriter:
+    """
+    Writes samples out to numbered .npz files of `shard_size` samples each, with only the last one shorter. Each file
+    holds the arrays `boards` (N, 12, 8), `side_to_move`, `scores`, `results`, `game_ids` and `plies`.
+    """
+
+    def __init__(self, directory, shard_size=DEFAULT_SHARD_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.shard_size = shard_size
+        self.paths = []
+        self.total = 0
+        self.count = 0
+        self.boards = np.zeros((shard_size, NUMBER_OF_PLANES, PACKED_SQUARES), dtype=np.uint8)
+        self.side_to_move = np.zeros(shard_size, dtype=np.int8)
+        self.scores = np.zeros(shard_size, dtype=np.int32)
+        self.results = np.zeros(shard_size, dtype=np.int8)
+        self.game_ids = np.zeros(shard_size, dtype=np.int32)
+        self.plies = np.zeros(shard_size, dtype=np.int16)
+
+    def write(self, sample):
+        index = self.count
+        self.boards[index] = sample.board
+        self.side_to_move[index] = sample.side_to_move
+        self.scores[index] = sample.score
+        self.results[index] = sample.result
+        self.game_ids[index] = sample.game_id
+        self.plies[index] = sample.ply
+        self.count += 1
+        self.total += 1
+        if self.count == self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes out the samples which have not yet been written, as a shard of their own.
+        """
+        if not self.count:
+            return
+        path = os.path.join(self.directory, SHARD_NAME.format(len(self.paths)))
+        count = self.count
+        np.savez(path, boards=self.boards[:count], side_to_move=self.side_to_move[:count], scores=self.scores[:count],
+                 results=self.results[:count], game_ids=self.game_ids[:count], plies=self.plies[:count])
+        self.paths.append(path)
+        self.count = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+
+def load_shards(directory):
+    """
+    Yields the contents of each shard in the directory, in order, as a dictionary of arrays.
+    """
+    for path in sorted(glob.glob(os.path.join(directory, SHARD_NAME.replace('{:05d}', '*')))):
+        with np.load(path) as shard:
+            yield {name: shard[name] for name in shard.files}
+
+
+def read_game_tasks(path, seed=0):
+    """
+    Reads games to replay from a self-play .jsonl file, one at a time.
+    """
+    with open(path) as games_file:
+        for line in games_file:
+            if line.strip():
+                record = json.loads(line)
+                yield GameTask(game_id=record['game_id'], seed=seed + record['game_id'],
+                               moves=[move['uci'] for move in record['moves']], result=record['result'])
+
+
+def generate(tasks, settings, directory, shard_size=DEFAULT_SHARD_SIZE, workers=1, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Samples and scores positions from each of the games across `workers` processes, writing them into shards in the
+    directory. Returns the number of samples written.
+    """
+    task_queue = multiprocessing.Queue(maxsize=queue_size)
+    result_queue = multiprocessing.Queue(maxsize=queue_size)
+    processes = [multiprocessing.Process(target=_work, args=(task_queue, result_queue, settings), daemon=True)
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    # Fed from a thread, so that writing out results never waits for the task queue to have room
+    feeder = threading.Thread(target=_feed, args=(tasks, task_queue, workers), daemon=True)
+    feeder.start()
+
+    try:
+        with ShardWriter(directory, shard_size) as writer:
+            finished = 0
+            while finished < workers:
+                samples = result_queue.get()
+                if samples is None:
+                    finished += 1
+                elif isinstance(samples, str):
+                    raise RuntimeError('A dataset worker failed:\n' + samples)
+                else:
+                    for sample in samples:
+                        writer.write(sample)
+            return writer.total
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
+
+
+def _feed(tasks, task_queue, workers):
+    for task in tasks:
+        task_queue.put(task)
+    for _ in range(workers):
+        task_queue.put(None)
+
+
+def _work(task_queue, result_queue, settings):
+    while True:
+        task = task_queue.get()
+        if task is None:
+            result_queue.put(None)
+            return
+        try:
+            result_queue.put(sample_game(task, settings))
+        except Exception:
+            result_queue.put(traceback.format_exc())
+            return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generates a dataset of positions scored by the bot.')
+    parser.add_argument('--output', default='dataset', help='the directory to write the shards to')
+    parser.add_argument('--games', type=int, default=100, help='the number of games to play')
+    parser.add_argument('--replay', help='a self-play .jsonl file of games to replay, instead of playing new ones')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='the number of worker processes (default: one per CPU)')
+    parser.add_argument('--depth', type=int, default=3, help='the depth to score positions to')
+    parser.add_argument('--nodes', type=int, default=None,
+                        help='the number of nodes to score each position with, if fewer than the depth would take')
+    parser.add_argument('--play-depth', type=int, default=2, help='the depth the bot plays new games at')
+    parser.add_argument('--sample-rate', type=float, default=0.25, help='the share of positions to sample')
+    parser.add_argument('--random-plies', type=int, default=8,
+                        help='the number of random moves each new game opens with, so that games differ')
+    parser.add_argument('--max-plies', type=int, default=200,
+                        help='the number of plies after which a new game is scored as a draw')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help='the number of samples per shard')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='the number of games queued for, or waiting to be written by, the workers')
+    parser.add_argument('--seed', type=int, default=0, help='the seed for sampling and random opening moves')
+    args = parser.parse_args(argv)
+
+    settings = DatasetSettings(depth=args.depth, node_budget=args.nodes, play_depth=args.play_depth,
+                               sample_rate=args.sample_rate, random_plies=args.random_plies, max_plies=args.max_plies)
+    if args.replay:
+        tasks = read_game_tasks(args.replay, args.seed)
+    else:
+        tasks = (GameTask(game_id=game_id, seed=args.seed + game_id, moves=None, result=None)
+                 for game_id in range(args.games))
+
+    total = generate(tasks, settings, args.output, args.shard_size, args.workers, args.queue_size)
+    print('Wrote {} positions to {}'.format(total, args.output))
+
+
+if __name__ == '__main__':
+    main()
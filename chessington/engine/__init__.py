@@ -0,0 +1,39 @@
+"""
+The chess engine: the board, pieces and computer opponent, with no dependency on the GUI.
+
+The most used classes can be imported from here, and their modules are only imported when first asked for.
+"""
+
+import importlib
+import os
+
+_EXPORTS = {
+    'Board': 'chessington.engine.board',
+    'Player': 'chessington.engine.data',
+    'Square': 'chessington.engine.data',
+    'Move': 'chessington.engine.data',
+    'Pawn': 'chessington.engine.pieces',
+    'Knight': 'chessington.engine.pieces',
+    'Bishop': 'chessington.engine.pieces',
+    'Rook': 'chessington.engine.pieces',
+    'Queen': 'chessington.engine.pieces',
+    'King': 'chessington.engine.pieces',
+    'Bot': 'chessington.engine.bot',
+    'SearchResult': 'chessington.engine.bot',
+    'TimeManager': 'chessington.engine.bot',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+if os.environ.get('CHESSINGTON_PROFILE'):
+    from chessington.engine import profiling
+    profiling.enable_from_environment()
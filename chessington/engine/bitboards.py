@@ -0,0 +1,183 @@
+"""
+Batched move counting and attack masks with NumPy bitboards.
+
+A position is held as 12 bitboards, one for each kind of piece numbered as by `get_piece_index`, where bit
+row * 8 + col is set if that piece stands on that square. A batch of N positions is an (N, 12) array of uint64,
+and every position in it is worked on at once with whole-array shifts and masks: one shift per direction for
+pawns, knights and kings, and a Kogge-Stone fill per direction for bishops, rooks and queens.
+
+Moves are counted one direction at a time. Each piece moves at most once in any one direction, and sliding pieces
+of the same side can never share a square of their rays in the same direction, since the nearer one blocks the
+other, so the number of moves in a direction is just the number of squares reached in it.
+
+The counts are of the moves `generate_moves` would generate, except for en passant captures, which are left out.
+
+NumPy is an optional dependency: install it with ``poetry install -E numpy``.
+"""
+
+import numpy as np
+
+from chessington.engine.board import BOARD_SIZE
+from chessington.engine.data import Player
+from chessington.engine.pieces import get_piece_index, PIECE_TYPES
+
+NUMBER_OF_PIECE_TYPES = len(PIECE_TYPES)
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(NUMBER_OF_PIECE_TYPES)
+
+ALL_SQUARES = np.uint64(0xFFFFFFFFFFFFFFFF)
+NOT_A_FILE = np.uint64(0xFEFEFEFEFEFEFEFE)
+NOT_H_FILE = np.uint64(0x7F7F7F7F7F7F7F7F)
+NOT_AB_FILES = np.uint64(0xFCFCFCFCFCFCFCFC)
+NOT_GH_FILES = np.uint64(0x3F3F3F3F3F3F3F3F)
+SECOND_RANK = np.uint64(0x000000000000FF00)
+SEVENTH_RANK = np.uint64(0x00FF000000000000)
+
+# Each direction is a shift (positive for towards higher square indices) and the mask of squares which a piece
+# shifted that way can land on without having wrapped around the edge of the board
+NORTH, SOUTH = (8, ALL_SQUARES), (-8, ALL_SQUARES)
+EAST, WEST = (1, NOT_A_FILE), (-1, NOT_H_FILE)
+NORTH_EAST, NORTH_WEST = (9, NOT_A_FILE), (7, NOT_H_FILE)
+SOUTH_EAST, SOUTH_WEST = (-7, NOT_A_FILE), (-9, NOT_H_FILE)
+
+ROOK_DIRECTIONS = [NORTH, SOUTH, EAST, WEST]
+BISHOP_DIRECTIONS = [NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST]
+KING_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+KNIGHT_DIRECTIONS = [(17, NOT_A_FILE), (15, NOT_H_FILE), (10, NOT_AB_FILES), (6, NOT_GH_FILES),
+                     (-6, NOT_AB_FILES), (-10, NOT_GH_FILES), (-15, NOT_A_FILE), (-17, NOT_H_FILE)]
+
+
+def shift(bitboards, direction):
+    """
+    Moves every piece on the bitboards one step in the given direction, dropping those which leave the board.
+    """
+    amount, mask = direction
+    if amount > 0:
+        return (bitboards << np.uint64(amount)) & mask
+    return (bitboards >> np.uint64(-amount)) & mask
+
+
+def _swar_popcount(bitboards):
+    counts = bitboards - ((bitboards >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    counts = (counts & np.uint64(0x3333333333333333)) + ((counts >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    counts = (counts + (counts >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((counts * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+def popcount(bitboards):
+    """
+    Counts the squares set on each bitboard.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bitboards).astype(np.int64)
+    return _swar_popcount(bitboards)
+
+
+def fill(sliders, empty, direction):
+    """
+    The Kogge-Stone occluded fill: every square the sliders can slide to in the given direction without passing
+    an occupied square, along with the sliders' own squares, in three doubling steps.
+    """
+    amount, mask = direction
+    empty = empty & mask
+    for _ in range(3):
+        sliders = sliders | (empty & shift(sliders, (amount, ALL_SQUARES)))
+        empty = empty & shift(empty, (amount, ALL_SQUARES))
+        amount *= 2
+    return sliders
+
+
+def slide(sliders, empty, direction):
+    """
+    The squares the sliders attack in the given direction: those they can slide to, and the first occupied square.
+    """
+    return shift(fill(sliders, empty, direction), direction)
+
+
+def boards_to_bitboards(boards):
+    """
+    Converts a list of boards into an (N, 12) array of piece bitboards, and an (N,) array which is True where white
+    is to move.
+    """
+    bitboards = []
+    for board in boards:
+        pieces = [0] * (2 * NUMBER_OF_PIECE_TYPES)
+        for row in range(BOARD_SIZE):
+            for col, piece in enumerate(board.board[row]):
+                if piece is not None:
+                    pieces[get_piece_index(piece)] |= 1 << (row * BOARD_SIZE + col)
+        bitboards.append(pieces)
+    white_to_move = np.array([board.current_player == Player.WHITE for board in boards], dtype=bool)
+    return np.array(bitboards, dtype=np.uint64).reshape(len(boards), 2 * NUMBER_OF_PIECE_TYPES), white_to_move
+
+
+def _split_sides(bitboards, white_to_move):
+    white, black = bitboards[:, :NUMBER_OF_PIECE_TYPES], bitboards[:, NUMBER_OF_PIECE_TYPES:]
+    to_move = white_to_move[:, np.newaxis]
+    return np.where(to_move, white, black), np.where(to_move, black, white)
+
+
+def count_moves_by_piece_type(bitboards, white_to_move):
+    """
+    Counts the moves available to the player to move in each position, for each type of piece, as an (N, 6) array
+    in the order of `PIECE_TYPES`.
+    """
+    ours, theirs = _split_sides(bitboards, white_to_move)
+    our_pieces = np.bitwise_or.reduce(ours, axis=1)
+    their_pieces = np.bitwise_or.reduce(theirs, axis=1)
+    empty = ~(our_pieces | their_pieces)
+    not_ours = ~our_pieces
+    counts = np.zeros((len(bitboards), NUMBER_OF_PIECE_TYPES), dtype=np.int64)
+
+    # Pawns move north for white and south for black, so both are worked out and the right one picked
+    pawns = ours[:, PAWN]
+    white_pawns = _count_pawn_moves(pawns, empty, their_pieces, NORTH, NORTH_EAST, NORTH_WEST, SECOND_RANK)
+    black_pawns = _count_pawn_moves(pawns, empty, their_pieces, SOUTH, SOUTH_EAST, SOUTH_WEST, SEVENTH_RANK)
+    counts[:, PAWN] = np.where(white_to_move, white_pawns, black_pawns)
+
+    for direction in KNIGHT_DIRECTIONS:
+        counts[:, KNIGHT] += popcount(shift(ours[:, KNIGHT], direction) & not_ours)
+    for direction in KING_DIRECTIONS:
+        counts[:, KING] += popcount(shift(ours[:, KING], direction) & not_ours)
+    for piece_type, directions in ((BISHOP, BISHOP_DIRECTIONS), (ROOK, ROOK_DIRECTIONS), (QUEEN, KING_DIRECTIONS)):
+        for direction in directions:
+            counts[:, piece_type] += popcount(slide(ours[:, piece_type], empty, direction) & not_ours)
+    return counts
+
+
+def _count_pawn_moves(pawns, empty, their_pieces, forward, capture_east, capture_west, start_rank):
+    single_pushes = shift(pawns, forward) & empty
+    double_pushes = shift(shift(pawns & start_rank, forward) & empty, forward) & empty
+    return popcount(single_pushes) + popcount(double_pushes) + \
+        popcount(shift(pawns, capture_east) & their_pieces) + popcount(shift(pawns, capture_west) & their_pieces)
+
+
+def count_moves(bitboards, white_to_move):
+    """
+    Counts the moves available to the player to move in each position, as an (N,) array.
+    """
+    return count_moves_by_piece_type(bitboards, white_to_move).sum(axis=1)
+
+
+def attack_masks(bitboards):
+    """
+    The squares attacked by each player in each position, as an (N, 2) array of bitboards with white's first.
+    Squares holding a player's own pieces count as attacked if they are defended.
+    """
+    occupied = np.bitwise_or.reduce(bitboards, axis=1)
+    empty = ~occupied
+    masks = np.zeros((len(bitboards), 2), dtype=np.uint64)
+    for side, (capture_east, capture_west) in enumerate(((NORTH_EAST, NORTH_WEST), (SOUTH_EAST, SOUTH_WEST))):
+        pieces = bitboards[:, side * NUMBER_OF_PIECE_TYPES:(side + 1) * NUMBER_OF_PIECE_TYPES]
+        attacks = shift(pieces[:, PAWN], capture_east) | shift(pieces[:, PAWN], capture_west)
+        for direction in KNIGHT_DIRECTIONS:
+            attacks |= shift(pieces[:, KNIGHT], direction)
+        for direction in KING_DIRECTIONS:
+            attacks |= shift(pieces[:, KING], direction)
+        orthogonal = pieces[:, ROOK] | pieces[:, QUEEN]
+        diagonal = pieces[:, BISHOP] | pieces[:, QUEEN]
+        for direction in ROOK_DIRECTIONS:
+            attacks |= slide(orthogonal, empty, direction)
+        for direction in BISHOP_DIRECTIONS:
+            attacks |= slide(diagonal, empty, direction)
+        masks[:, side] = attacks
+    return masks
@@ -3,13 +3,54 @@ A module providing a representation of a chess board. The rules of chess are not
 this is just a "dumb" board that will let you move pieces around as you like.
 """
 
+import copy
+import itertools
 from collections import namedtuple
 from enum import Enum, auto
 
-from chessington.engine.data import Player, Square
-from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.data import Player, Square, GameState
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King, get_piece_index, PIECE_TYPES
+from chessington.engine.evaluation import PIECE_POINTS, get_evaluation_tables, taper
+from chessington.engine.zobrist import get_zobrist_keys
 
 BOARD_SIZE = 8
+ALL_ROWS = (1 << BOARD_SIZE) - 1
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+FEN_PIECE_TYPES = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+FEN_PIECE_LETTERS = {piece_type: letter for letter, piece_type in FEN_PIECE_TYPES.items()}
+
+WHITE_KING_INDEX = PIECE_TYPES.index(King)
+BLACK_KING_INDEX = WHITE_KING_INDEX + len(PIECE_TYPES)
+
+# The order in which pieces are tried when looking for a legal move: kings and pawns have the fewest moves to try,
+# and when in check the king's own moves are the most likely way out
+LEGAL_MOVE_ORDER = {King: 0, Pawn: 1, Knight: 2, Bishop: 3, Rook: 4, Queen: 5}
+
+# The hash keys and score tables, which are looked up by `_load_tables` when the first board is created
+PIECE_SQUARE_KEYS = BLACK_TO_MOVE_KEY = EN_PASSANT_KEYS = None
+MATERIAL_SCORES = MIDDLEGAME_SCORES = ENDGAME_SCORES = PHASES = None
+
+
+def _load_tables():
+    global PIECE_SQUARE_KEYS, BLACK_TO_MOVE_KEY, EN_PASSANT_KEYS
+    global MATERIAL_SCORES, MIDDLEGAME_SCORES, ENDGAME_SCORES, PHASES
+    PIECE_SQUARE_KEYS, BLACK_TO_MOVE_KEY, EN_PASSANT_KEYS = get_zobrist_keys()
+    MATERIAL_SCORES, MIDDLEGAME_SCORES, ENDGAME_SCORES, PHASES = get_evaluation_tables()
+
+
+# The move tables, which are looked up by `_load_attack_tables` the first time a square is tested for attacks
+KNIGHT_TARGETS = KING_TARGETS = ROOK_RAYS = BISHOP_RAYS = None
+
+
+def _load_attack_tables():
+    global KNIGHT_TARGETS, KING_TARGETS, ROOK_RAYS, BISHOP_RAYS
+
+    # Imported here, as the moves module imports this one
+    from chessington.engine.moves import get_move_tables
+    tables = get_move_tables()
+    KNIGHT_TARGETS, KING_TARGETS = tables.knight_targets, tables.king_targets
+    ROOK_RAYS, BISHOP_RAYS = tables.rook_rays, tables.bishop_rays
 
 
 class Board:
@@ -18,9 +59,33 @@ class Board:
     """
 
     def __init__(self, player, board_state):
+        if PHASES is None:
+            _load_tables()
         self.current_player = Player.WHITE
         self.board = board_state
         self.en_passant_state = None
+        self.halfmove_clock = 0
+        self.fullmove_number = 1
+        self._shared_rows = 0
+
+        # A stack of the hashes of earlier positions, as nested (hash, rest of stack) pairs so that clones can share it
+        self.hash_history = None
+
+        # Running totals over all the pieces on the board, which are kept up to date as pieces are placed and removed
+        self._piece_hash = 0
+        self._material = 0
+        self._middlegame = 0
+        self._endgame = 0
+        self._phase = 0
+
+        # The index of the square each player's king is on, or None if it has been taken
+        self._white_king = None
+        self._black_king = None
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = board_state[row][col]
+                if piece is not None:
+                    self._add_to_totals(get_piece_index(piece), row * BOARD_SIZE + col, 1)
 
     @staticmethod
     def empty():
@@ -30,6 +95,73 @@ class Board:
     def at_starting_position():
         return Board(Player.WHITE, Board._create_starting_board())
 
+    @staticmethod
+    def from_fen(fen):
+        """
+        Creates a board from a position in Forsyth-Edwards Notation. Castling rights are ignored, as castling is not
+        implemented. The move counters are optional.
+        """
+        fields = fen.split()
+        if len(fields) < 2:
+            raise ValueError('Invalid FEN: {}'.format(fen))
+        ranks = fields[0].split('/')
+        if len(ranks) != BOARD_SIZE or fields[1] not in ('w', 'b'):
+            raise ValueError('Invalid FEN: {}'.format(fen))
+
+        board_state = Board._create_empty_board()
+        for rank_index, rank in enumerate(ranks):
+            row = BOARD_SIZE - 1 - rank_index
+            col = 0
+            for character in rank:
+                if character.isdigit():
+                    col += int(character)
+                elif character.lower() in FEN_PIECE_TYPES and col < BOARD_SIZE:
+                    player = Player.WHITE if character.isupper() else Player.BLACK
+                    board_state[row][col] = FEN_PIECE_TYPES[character.lower()](player)
+                    col += 1
+                else:
+                    raise ValueError('Invalid FEN: {}'.format(fen))
+            if col != BOARD_SIZE:
+                raise ValueError('Invalid FEN: {}'.format(fen))
+
+        board = Board(Player.WHITE, board_state)
+        board.current_player = Player.WHITE if fields[1] == 'w' else Player.BLACK
+
+        # FEN names the square the pawn skipped over, whereas the board remembers the square the pawn moved to
+        if len(fields) > 3 and fields[3] != '-':
+            skipped_square = Square.from_algebraic(fields[3])
+            direction = 1 if skipped_square.row == 2 else -1
+            board.en_passant_state = Square.at(skipped_square.row + direction, skipped_square.col)
+        if len(fields) > 5:
+            board.halfmove_clock = int(fields[4])
+            board.fullmove_number = int(fields[5])
+        return board
+
+    def to_fen(self):
+        """
+        Writes the position in Forsyth-Edwards Notation. No castling rights are given, as castling is not implemented.
+        """
+        ranks = []
+        for row in reversed(range(BOARD_SIZE)):
+            rank, empty_squares = '', 0
+            for piece in self.board[row]:
+                if piece is None:
+                    empty_squares += 1
+                    continue
+                if empty_squares:
+                    rank, empty_squares = rank + str(empty_squares), 0
+                letter = FEN_PIECE_LETTERS[type(piece)]
+                rank += letter.upper() if piece.player == Player.WHITE else letter
+            ranks.append(rank + (str(empty_squares) if empty_squares else ''))
+
+        en_passant = '-'
+        if self.en_passant_state is not None:
+            direction = -1 if self.en_passant_state.row == 3 else 1
+            en_passant = Square.at(self.en_passant_state.row + direction, self.en_passant_state.col).to_algebraic()
+
+        return '{} {} - {} {} {}'.format('/'.join(ranks), 'w' if self.current_player == Player.WHITE else 'b',
+                                         en_passant, self.halfmove_clock, self.fullmove_number)
+
     @staticmethod
     def _create_empty_board():
         return [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
@@ -51,11 +183,69 @@ class Board:
 
         return board
 
+    def clone(self):
+        """
+        Creates a copy of the board which can be changed independently of this one. The rows of squares are shared
+        between the two boards until one of them changes a row, at which point that board takes its own copy of it.
+        """
+        clone = copy.copy(self)
+        clone.board = list(self.board)
+        clone._shared_rows = self._shared_rows = ALL_ROWS
+        return clone
+
+    def get_position_hash(self):
+        """
+        A 64-bit Zobrist hash of the pieces on the board, the player to move and the en passant square. The part
+        for the pieces is kept up to date by `set_piece`, so this is cheap to call.
+        """
+        position_hash = self._piece_hash
+        if self.current_player == Player.BLACK:
+            position_hash ^= BLACK_TO_MOVE_KEY
+        if self.en_passant_state is not None:
+            position_hash ^= EN_PASSANT_KEYS[self.en_passant_state.row * BOARD_SIZE + self.en_passant_state.col]
+        return position_hash
+
     def set_piece(self, square, piece):
         """
         Places the piece at the given position on the board.
         """
-        self.board[square.row][square.col] = piece
+        row = square.row
+        if self._shared_rows >> row & 1:
+            self.board[row] = self.board[row][:]
+            self._shared_rows &= ~(1 << row)
+        index = row * BOARD_SIZE + square.col
+        old_piece = self.board[row][square.col]
+        if old_piece is not None:
+            self._add_to_totals(get_piece_index(old_piece), index, -1)
+        if piece is not None:
+            self._add_to_totals(get_piece_index(piece), index, 1)
+        self.board[row][square.col] = piece
+
+    def _add_to_totals(self, piece_index, square_index, sign):
+        self._piece_hash ^= PIECE_SQUARE_KEYS[piece_index][square_index]
+        self._material += sign * MATERIAL_SCORES[piece_index]
+        self._middlegame += sign * MIDDLEGAME_SCORES[piece_index][square_index]
+        self._endgame += sign * ENDGAME_SCORES[piece_index][square_index]
+        self._phase += sign * PHASES[piece_index]
+        if piece_index == WHITE_KING_INDEX:
+            if sign > 0:
+                self._white_king = square_index
+            elif self._white_king == square_index:
+                self._white_king = None
+        elif piece_index == BLACK_KING_INDEX:
+            if sign > 0:
+                self._black_king = square_index
+            elif self._black_king == square_index:
+                self._black_king = None
+
+    def evaluate(self):
+        """
+        Scores the position in centipawns, from the point of view of the player whose turn it is: the material on the
+        board, plus piece-square scores blended between middlegame and endgame by how much material is left. The
+        totals are kept up to date by `set_piece`, so this is cheap to call.
+        """
+        score = self._material + taper(self._middlegame, self._endgame, self._phase)
+        return score if self.current_player == Player.WHITE else -score
 
     def get_piece(self, square):
         """
@@ -73,19 +263,193 @@ class Board:
                     return Square.at(row, col)
         raise Exception('The supplied piece is not on the board')
 
+    def find_king(self, player):
+        """
+        The square the player's king is on, or None if it is not on the board. Kings are tracked by `set_piece`, so
+        this is cheap to call.
+        """
+        index = self._white_king if player == Player.WHITE else self._black_king
+        if index is not None:
+            return Square.at(index // BOARD_SIZE, index % BOARD_SIZE)
+
+        # Only needed if a board was set up with more than one king for a player and one of them has since gone
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                piece = self.board[row][col]
+                if type(piece) is King and piece.player == player:
+                    return Square.at(row, col)
+        return None
+
+    def is_in_check(self, player):
+        """
+        Whether the player's king is attacked by any of the opponent's pieces. A player with no king is not in check.
+        """
+        king_square = self.find_king(player)
+        return king_square is not None and self.is_square_attacked(king_square, player.opponent())
+
+    def is_square_attacked(self, square, by_player):
+        """
+        Whether any of the player's pieces could capture a piece on the given square. Rather than generating the
+        player's moves, this looks outward from the square for each kind of attacker, and stops at the first found.
+        """
+        if KNIGHT_TARGETS is None:
+            _load_attack_tables()
+        squares = self.board
+        row, col = square.row, square.col
+        index = row * BOARD_SIZE + col
+
+        for target in KNIGHT_TARGETS[index]:
+            piece = squares[target >> 3][target & 7]
+            if type(piece) is Knight and piece.player == by_player:
+                return True
+
+        for target in KING_TARGETS[index]:
+            piece = squares[target >> 3][target & 7]
+            if type(piece) is King and piece.player == by_player:
+                return True
+
+        # A pawn attacks diagonally forwards, so its attackers stand diagonally behind the square from its side
+        pawn_row = row - 1 if by_player == Player.WHITE else row + 1
+        if 0 <= pawn_row < BOARD_SIZE:
+            for pawn_col in (col - 1, col + 1):
+                if 0 <= pawn_col < BOARD_SIZE:
+                    piece = squares[pawn_row][pawn_col]
+                    if type(piece) is Pawn and piece.player == by_player:
+                        return True
+
+        for rays, slider_type in ((ROOK_RAYS, Rook), (BISHOP_RAYS, Bishop)):
+            for ray in rays[index]:
+                for target in ray:
+                    piece = squares[target >> 3][target & 7]
+                    if piece is not None:
+                        if piece.player == by_player and type(piece) in (slider_type, Queen):
+                            return True
+                        break
+        return False
+
+    def has_legal_move(self, player, in_check=None):
+        """
+        Whether the player has any move which does not leave their own king attacked. Pieces are tried one at a time,
+        cheapest first, and the search stops at the first legal move found. Callers which already know whether the
+        player is in check can say so, to save working it out again.
+        """
+
+        # Imported here, as the moves module imports this one
+        from chessington.engine.moves import generate_moves, new_move_buffer, decode_move, might_expose_king
+
+        # Only the player to move can capture en passant, so the board turned round to the other player has none
+        board = self
+        if board.current_player != player:
+            board = self.clone()
+            board.current_player = player
+            board.en_passant_state = None
+
+        # Unless the player is in check, only moves which `might_expose_king` need playing out to see if they are legal
+        king_square = self.find_king(player)
+        if king_square is None:
+            return generate_moves(board, new_move_buffer()) > 0
+        king_index = king_square.row * BOARD_SIZE + king_square.col
+        if in_check is None:
+            in_check = self.is_square_attacked(king_square, player.opponent())
+
+        groups = [[] for _ in LEGAL_MOVE_ORDER]
+        for row, pieces in enumerate(self.board):
+            for col, piece in enumerate(pieces):
+                if piece is not None and piece.player == player:
+                    groups[LEGAL_MOVE_ORDER[type(piece)]].append(row * BOARD_SIZE + col)
+
+        buffer = new_move_buffer()
+        for from_index in itertools.chain.from_iterable(groups):
+            count = generate_moves(board, buffer, (from_index,))
+            for index in range(count):
+                if not in_check and not might_expose_king(buffer[index], king_index):
+                    return True
+                move = decode_move(buffer[index])
+                child = board.clone()
+                child.move_piece(move.from_square, move.to_square)
+                if not child.is_in_check(player):
+                    return True
+        return False
+
+    def game_state(self):
+        """
+        Whether the game is over, and if so how, from the point of view of the player whose turn it is.
+        """
+        player = self.current_player
+        if self.find_king(player) is None or self.find_king(player.opponent()) is None:
+            return GameState.KING_CAPTURED
+        in_check = self.is_in_check(player)
+        if not self.has_legal_move(player, in_check):
+            return GameState.CHECKMATE if in_check else GameState.STALEMATE
+        if self.is_repetition():
+            return GameState.REPETITION
+        return GameState.CHECK if in_check else GameState.IN_PROGRESS
+
+    def has_non_pawn_material(self, player):
+        """
+        Whether the player has any pieces other than pawns and the king.
+        """
+        for row in self.board:
+            for piece in row:
+                if piece is not None and piece.player == player and not isinstance(piece, (Pawn, King)):
+                    return True
+        return False
+
     def move_piece(self, from_square, to_square):
         """
         Moves the piece from the given starting square to the given destination square.
         """
         moving_piece = self.get_piece(from_square)
         if moving_piece is not None and moving_piece.player == self.current_player:
+            is_capture = not self.is_square_empty(to_square)
+            previous_hash = self.get_position_hash()
             self.set_piece(to_square, moving_piece)
             self.promotion_check(to_square, from_square, moving_piece)
             self.execute_en_passant(to_square, from_square, moving_piece)
             self.set_piece(from_square, None)
             self.set_en_passant_state(to_square, from_square, moving_piece)
+            self.update_move_counters(moving_piece, is_capture)
+            self.update_hash_history(previous_hash)
             self.current_player = self.current_player.opponent()
 
+    def update_move_counters(self, moving_piece, is_capture):
+        """
+        Counts the half-moves since the last pawn move or capture, and the full moves since the start of the game.
+        """
+        if is_capture or isinstance(moving_piece, Pawn):
+            self.halfmove_clock = 0
+        else:
+            self.halfmove_clock += 1
+        if self.current_player == Player.BLACK:
+            self.fullmove_number += 1
+
+    def update_hash_history(self, previous_hash):
+        """
+        Pushes the hash of the position before the move onto the history. Positions from before a pawn move or a
+        capture can never be repeated, so the history is cleared after those moves.
+        """
+        if self.halfmove_clock == 0:
+            self.hash_history = None
+        else:
+            self.hash_history = (previous_hash, self.hash_history)
+
+    def is_repetition(self, count=3):
+        """
+        Whether the current position has now occurred at least `count` times. Only positions since the last pawn
+        move or capture with the same player to move - every second entry of the history - need to be compared.
+        """
+        position_hash = self.get_position_hash()
+        occurrences = 1
+        history = self.hash_history[1] if self.hash_history is not None else None
+        while history is not None:
+            if history[0] == position_hash:
+                occurrences += 1
+                if occurrences >= count:
+                    return True
+            history = history[1]
+            history = history[1] if history is not None else None
+        return False
+
     def set_en_passant_state(self, to_square, from_square, moving_piece):
         if not isinstance(moving_piece, Pawn):
             self.en_passant_state = None
@@ -149,18 +513,4 @@ class Board:
         return valid_moves
 
     def get_move_points(self, target_square):
-        piece = self.get_piece(target_square)
-        piece_name = type(piece).__name__
-        points_dict = {
-            "Pawn": 1,
-            "Bishop": 3,
-            "Knight": 3,
-            "Rook": 5,
-            "Queen": 9,
-            "King": 15
-        }
-        points = points_dict[piece_name]
-        print(piece_name)
-        print(points)
-        return points
-
+        return PIECE_POINTS[type(self.get_piece(target_square))]
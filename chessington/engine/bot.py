@@ -1,3 +1,803 @@
+"""
+A computer opponent, which searches ahead through the possible moves to choose one to play.
 
+The search is an iterative-deepening alpha-beta search, run under a time manager so that a move is always
+returned within the time budget - even if that means abandoning an iteration part way through.
+"""
 
-class Bot:
\ No newline at end of file
+import threading
+import time
+from collections import namedtuple
+
+from chessington.engine.board import BOARD_SIZE
+from chessington.engine.moves import MoveBuffers, SQUARES, CAPTURE, PROMOTION, generate_moves, new_move_buffer, \
+    decode_move, move_flags, move_to, might_expose_king
+from chessington.engine.transposition import TranspositionTable, DEFAULT_TABLE_ENTRIES, EXACT, LOWER_BOUND, UPPER_BOUND
+
+DEFAULT_MAX_DEPTH = 64
+DEFAULT_MOVES_TO_GO = 30
+DEFAULT_CHECK_INTERVAL = 32
+INFINITY = 1000000
+# The score for checkmating the opponent, less the number of plies it takes, so that quicker mates are preferred
+MATE_SCORE = 100000
+# Scores at least this close to MATE_SCORE are mates, which the transposition table stores as the distance to mate
+# from the position itself, rather than from the root of the search which found them
+MATE_THRESHOLD = MATE_SCORE - DEFAULT_MAX_DEPTH
+EN_PASSANT_VICTIM_VALUE = 1
+
+NULL_MOVE_REDUCTION = 2
+NULL_MOVE_MIN_DEPTH = 3
+LATE_MOVE_REDUCTION = 1
+LATE_MOVE_MIN_DEPTH = 3
+LATE_MOVE_FIRST_INDEX = 4
+# How far below alpha the static score must be for quiet moves to be skipped, by remaining depth
+FUTILITY_MARGINS = (0, 200, 500)
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside the search when the time manager says to stop, to unwind back to the root.
+    """
+    pass
+
+
+class SearchResult(namedtuple('SearchResult', 'move score depth nodes elapsed overrun aborted')):
+    """
+    The outcome of a search: the chosen move, its score, the last fully completed depth, the number of nodes
+    searched, the time taken and by how much (if at all) the time budget was exceeded, in seconds.
+    """
+    pass
+
+
+class SearchOptions(namedtuple('SearchOptions', 'principal_variation null_move late_move_reductions futility',
+                                 defaults=(True, True, True, True))):
+    """
+    Which of the techniques for searching fewer nodes the bot uses; all of them by default.
+
+    - principal_variation: search every move after the first with a null window, only searching it again with the
+      full window if it turns out to be better.
+    - null_move: let the opponent move twice, with a reduced depth; if they still cannot get below beta, assume the
+      position is good enough not to search. Skipped when the player has only pawns left, as those positions are
+      the ones where having to move can be a disadvantage (zugzwang).
+    - late_move_reductions: search quiet moves late in the move order to a reduced depth, searching them again to
+      the full depth only if they turn out to be better.
+    - futility: near the leaves, skip quiet moves when the position is so far below alpha that they cannot bring
+      it back up.
+    """
+    pass
+
+
+class AnalysisLine(namedtuple('AnalysisLine', 'move score pv')):
+    """
+    One of the best moves found by an analysis, with its score and the principal variation - the line of play the
+    search expects to follow it, starting with the move itself.
+    """
+    pass
+
+
+class Analysis(namedtuple('Analysis', 'depth lines nodes nps elapsed')):
+    """
+    The best lines found by an analysis once it has completed a depth, best first, with the number of nodes
+    searched so far, the nodes searched per second, and the time taken in seconds.
+    """
+    pass
+
+
+class TimeManager:
+    """
+    Decides how long a search may run for, and tells the search when to stop.
+
+    The search calls `should_stop` only once every `check_interval` nodes, so that reading the clock stays cheap.
+    The search can also be cancelled from another thread by calling `cancel`, or by setting the `stop_event`. A
+    `node_budget` stops the search after about that many nodes, whatever the time, which makes it repeatable.
+    """
+
+    def __init__(self, budget=None, stop_event=None, check_interval=DEFAULT_CHECK_INTERVAL, node_budget=None):
+        self.budget = budget
+        self.node_budget = node_budget
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        self.check_interval = check_interval
+        self.start_time = None
+        self.deadline = None
+
+    @staticmethod
+    def from_clock(remaining, increment=0.0, moves_to_go=None, safety_margin=0.05):
+        """
+        Creates a time manager which allocates a share of the remaining clock time (in seconds) to this move,
+        plus most of the increment, without ever allocating more time than is left on the clock.
+        """
+        moves_to_go = moves_to_go or DEFAULT_MOVES_TO_GO
+        budget = remaining / moves_to_go + increment * 0.75
+        budget = min(budget, remaining - safety_margin)
+        return TimeManager(budget=max(budget, 0.0))
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.deadline = None if self.budget is None else self.start_time + self.budget
+
+    def set_budget(self, budget):
+        """
+        Gives a running search a new budget, counted from now, such as when a search on the opponent's time
+        becomes the real search. A budget of None lets the search run until it is cancelled.
+        """
+        self.budget = None if budget is None else self.elapsed() + budget
+        self.deadline = None if budget is None else self.start_time + self.budget
+
+    def cancel(self):
+        """
+        Asks the search to stop as soon as possible. Safe to call from any thread.
+        """
+        self.stop_event.set()
+
+    def should_stop(self, nodes=0):
+        if self.stop_event.is_set():
+            return True
+        if self.node_budget is not None and nodes >= self.node_budget:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def overrun(self):
+        """
+        How far past the budget the search has run, in seconds.
+        """
+        if self.budget is None:
+            return 0.0
+        return max(0.0, self.elapsed() - self.budget)
+
+
+class Bot:
+    """
+    A computer player, which picks a move for whichever player's turn it is on the board.
+
+    Search results are kept in a transposition table. If `helpers` is more than zero, the table is put in shared
+    memory, and that many helper processes search the same position alongside the main search, sharing what they
+    find through the table (the "Lazy SMP" approach). The helpers are started by the first search and reused by
+    every search after it. Call `close` when finished with a bot that has helpers.
+
+    The techniques the search uses to prune the tree are chosen by `options`; see `SearchOptions`.
+    """
+
+    def __init__(self, max_depth=DEFAULT_MAX_DEPTH, helpers=0, table=None, table_entries=DEFAULT_TABLE_ENTRIES,
+                 options=None):
+        self.max_depth = max_depth
+        self.helpers = helpers
+        self.options = options if options is not None else SearchOptions()
+        if table is None:
+            table = TranspositionTable.create_shared(table_entries) if helpers else TranspositionTable(table_entries)
+        self.table = table
+        self.nodes = 0
+        self.depth = 0
+        self.root_moves = []
+        self._time_manager = None
+        self._check_countdown = 0
+        self._move_buffers = MoveBuffers(max_depth)
+        self._helper_pool = None
+
+    def close(self):
+        """
+        Stops the helper processes, if any, and releases the shared memory used by the transposition table.
+        """
+        if self._helper_pool is not None:
+            self._helper_pool.close()
+            self._helper_pool = None
+        self.table.close(unlink=True)
+
+    def search(self, board, time_manager=None, max_depth=None):
+        """
+        Searches for the best move on the board, deepening one ply at a time until the maximum depth is reached
+        or the time manager says to stop. Returns the best move from the deepest completed iteration.
+        """
+        time_manager = time_manager if time_manager is not None else TimeManager()
+        max_depth = max_depth if max_depth is not None else self.max_depth
+        time_manager.start()
+
+        helpers = self._start_helpers(board, max_depth)
+        try:
+            return self._iterative_deepening(board, time_manager, max_depth)
+        finally:
+            self._stop_helpers(helpers)
+
+    async def search_async(self, board, time_manager=None, max_depth=None):
+        """
+        Runs the search in a worker thread. Cancelling the awaiting task stops the search.
+        """
+        import asyncio
+        time_manager = time_manager if time_manager is not None else TimeManager()
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self.search, board, time_manager, max_depth)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            time_manager.cancel()
+            raise
+
+    def _start_helpers(self, board, max_depth):
+        if not self.helpers:
+            return None
+        if self._helper_pool is None:
+            self._helper_pool = HelperPool(self.helpers, self.table, self.options)
+        self._helper_pool.start(board, max_depth)
+        return self._helper_pool
+
+    @staticmethod
+    def _stop_helpers(helpers):
+        if helpers is not None:
+            helpers.stop()
+
+    def analyse(self, board, lines=1, time_manager=None, max_depth=None):
+        """
+        Analyses the board, deepening one ply at a time until the maximum depth is reached or the time manager says
+        to stop, and yields an `Analysis` of the best `lines` moves after each depth. The moves are searched once
+        per depth, with the transposition table and move order carried over from one depth to the next, so finding
+        several lines costs much less than searching for each of them separately.
+        """
+        time_manager = time_manager if time_manager is not None else TimeManager()
+        max_depth = max_depth if max_depth is not None else self.max_depth
+        time_manager.start()
+
+        helpers = self._start_helpers(board, max_depth)
+        try:
+            root_moves = self._prepare_search(board, time_manager, max_depth)
+            for depth in range(1, max_depth + 1 if root_moves else 1):
+                try:
+                    ranked = self._search_root(board, root_moves, depth, lines)
+                except SearchAborted:
+                    return
+                self.depth = depth
+                move_ranked_to_front(root_moves, ranked)
+
+                elapsed = time_manager.elapsed()
+                yield Analysis(depth=depth, nodes=self.nodes, nps=int(self.nodes / elapsed) if elapsed else 0,
+                               elapsed=elapsed, lines=[
+                                   AnalysisLine(move=decode_move(move), score=score,
+                                                pv=self.get_principal_variation(board, move, depth))
+                                   for move, score in ranked])
+
+                if time_manager.should_stop(self.nodes):
+                    return
+        finally:
+            self._stop_helpers(helpers)
+
+    async def analyse_async(self, board, lines=1, time_manager=None, max_depth=None):
+        """
+        Runs `analyse` in a worker thread, as an async iterator. Leaving the loop early, or cancelling the task
+        iterating over it, stops the analysis.
+        """
+        import asyncio
+        time_manager = time_manager if time_manager is not None else TimeManager()
+        loop = asyncio.get_running_loop()
+        updates = asyncio.Queue()
+        finished = object()
+
+        def put(update):
+            try:
+                loop.call_soon_threadsafe(updates.put_nowait, update)
+            except RuntimeError:
+                # The event loop has already closed, so nobody is listening any more
+                time_manager.cancel()
+
+        def run():
+            try:
+                for analysis in self.analyse(board, lines, time_manager, max_depth):
+                    put(analysis)
+            finally:
+                put(finished)
+
+        future = loop.run_in_executor(None, run)
+        try:
+            while True:
+                update = await updates.get()
+                if update is finished:
+                    break
+                yield update
+            await future
+        finally:
+            time_manager.cancel()
+
+    def get_principal_variation(self, board, move, max_length):
+        """
+        Follows the best moves stored in the transposition table from the position after the given 16-bit move,
+        returning the line of play the search expects, as a list of moves starting with the given one. The line
+        stops early if the table no longer holds the next position.
+        """
+        line = [decode_move(move)]
+        board = self.make_move(board, move)
+        buffer = new_move_buffer()
+        seen = set()
+        while len(line) < max_length:
+            key = board.get_position_hash()
+            entry = self.table.probe(key)
+            if entry is None or not entry.move or key in seen:
+                break
+            count = generate_moves(board, buffer)
+            if entry.move not in buffer[:count]:
+                break
+            seen.add(key)
+            line.append(decode_move(entry.move))
+            board = self.make_move(board, entry.move)
+        return line
+
+    def _prepare_search(self, board, time_manager, max_depth):
+        """
+        Resets the counters for a new search, and lists the legal moves at the root, best first. The list is kept in
+        `root_moves`, so that a search stopped before finishing a depth can still fall back to the first of them.
+        """
+        self._time_manager = time_manager
+        self._check_countdown = time_manager.check_interval
+        self.nodes = 0
+        self.depth = 0
+        if len(self._move_buffers.buffers) <= max_depth:
+            self._move_buffers = MoveBuffers(max_depth)
+
+        root_buffer = self._move_buffers[0]
+        count = generate_moves(board, root_buffer)
+        order_moves(board, root_buffer, count)
+        player = board.current_player
+        root_moves = [move for move in root_buffer[:count] if not self.make_move(board, move).is_in_check(player)]
+        entry = self.table.probe(board.get_position_hash())
+        if entry is not None and entry.move in root_moves:
+            root_moves.remove(entry.move)
+            root_moves.insert(0, entry.move)
+        self.root_moves = root_moves
+        return root_moves
+
+    def _iterative_deepening(self, board, time_manager, max_depth, start_depth=1):
+        root_moves = self._prepare_search(board, time_manager, max_depth)
+        best_move = root_moves[0] if root_moves else None
+        best_score = -INFINITY
+        if not root_moves:
+            best_score = -MATE_SCORE if board.is_in_check(board.current_player) else 0
+        aborted = False
+
+        for depth in range(min(start_depth, max_depth), max_depth + 1 if root_moves else 1):
+            try:
+                ranked = self._search_root(board, root_moves, depth)
+            except SearchAborted:
+                aborted = True
+                break
+            best_move, best_score = ranked[0]
+            self.depth = depth
+
+            # Search the best move first in the next iteration, so that it is always looked at
+            move_ranked_to_front(root_moves, ranked)
+
+            if time_manager.should_stop(self.nodes):
+                break
+
+        return SearchResult(move=decode_move(best_move) if best_move is not None else None, score=best_score,
+                            depth=self.depth, nodes=self.nodes, elapsed=time_manager.elapsed(),
+                            overrun=time_manager.overrun(), aborted=aborted)
+
+    def _search_root(self, board, moves, depth, lines=1):
+        """
+        Searches each of the moves at the root, returning the best `lines` of them as (move, score) pairs, best
+        first. Only moves which might make it into the best `lines` need an exact score, so every move is searched
+        with alpha at the score of the worst of the best lines found so far.
+        """
+        ranked = []
+        beta = INFINITY
+        for move in moves:
+            is_pv_node = len(ranked) < lines
+            alpha = -INFINITY if is_pv_node else ranked[-1][1]
+            child = self.make_move(board, move)
+            if not is_pv_node and self.options.principal_variation:
+                score = -self._negamax(child, depth - 1, -alpha - 1, -alpha, 1, False)
+                if score > alpha:
+                    score = -self._negamax(child, depth - 1, -beta, -alpha, 1, True)
+            else:
+                score = -self._negamax(child, depth - 1, -beta, -alpha, 1, is_pv_node)
+            if len(ranked) < lines or score > alpha:
+                position = len(ranked)
+                while position > 0 and ranked[position - 1][1] < score:
+                    position -= 1
+                ranked.insert(position, (move, score))
+                del ranked[lines:]
+        best_move, best_score = ranked[0]
+        self.table.store(board.get_position_hash(), best_move, best_score, depth, EXACT)
+        return ranked
+
+    def _negamax(self, board, depth, alpha, beta, ply, is_pv_node, allow_null_move=True):
+        """
+        Scores the board to the given depth. Nodes on the principal variation - the first move searched at each ply
+        from the root, and any move which is searched again because it turned out to be better - are never pruned.
+        """
+        self.nodes += 1
+        self._check_countdown -= 1
+        if self._check_countdown <= 0:
+            self._check_countdown = self._time_manager.check_interval
+            if self._time_manager.should_stop(self.nodes):
+                raise SearchAborted()
+
+        # Treat any repeated position as a draw, as going round in circles cannot gain anything
+        if board.is_repetition(2):
+            return 0
+
+        if depth == 0:
+            return self.evaluate(board)
+
+        # Use the result of an earlier search of this position if it was deep enough, otherwise try its best move first
+        key = board.get_position_hash()
+        entry = self.table.probe(key)
+        table_move = 0
+        if entry is not None:
+            table_move = entry.move
+            if entry.depth >= depth:
+                table_score = score_from_table(entry.score, ply)
+                if entry.bound == EXACT or \
+                        (entry.bound == LOWER_BOUND and table_score >= beta) or \
+                        (entry.bound == UPPER_BOUND and table_score <= alpha):
+                    return table_score
+
+        # Moves which leave the king attacked are not legal, and are skipped
+        player = board.current_player
+        king_square = board.find_king(player)
+        king_index = king_square.row * BOARD_SIZE + king_square.col if king_square is not None else None
+        in_check = king_square is not None and board.is_square_attacked(king_square, player.opponent())
+
+        options = self.options
+        static_score = None
+
+        if options.null_move and allow_null_move and not is_pv_node and not in_check and \
+                depth >= NULL_MOVE_MIN_DEPTH and board.has_non_pawn_material(player):
+            static_score = self.evaluate(board)
+            if static_score >= beta:
+                score = -self._negamax(self.make_null_move(board), depth - 1 - NULL_MOVE_REDUCTION, -beta, -beta + 1,
+                                       ply + 1, False, allow_null_move=False)
+                if score >= beta:
+                    return score
+
+        futility_score = None
+        if options.futility and not is_pv_node and not in_check and depth < len(FUTILITY_MARGINS):
+            static_score = static_score if static_score is not None else self.evaluate(board)
+            if static_score + FUTILITY_MARGINS[depth] <= alpha:
+                futility_score = static_score + FUTILITY_MARGINS[depth]
+
+        moves = self._move_buffers[ply]
+        count = generate_moves(board, moves)
+        if count == 0:
+            return -(MATE_SCORE - ply) if in_check else 0
+        order_moves(board, moves, count)
+        if table_move:
+            move_to_front(moves, count, table_move)
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, 0
+        searched = 0
+        for index in range(count):
+            move = moves[index]
+            is_quiet = not move_flags(move) & (CAPTURE | PROMOTION)
+            if futility_score is not None and is_quiet:
+                best_score = max(best_score, futility_score)
+                continue
+
+            child = self.make_move(board, move)
+            if king_index is not None and (in_check or might_expose_king(move, king_index)) and \
+                    child.is_in_check(player):
+                continue
+            if searched == 0:
+                score = -self._negamax(child, depth - 1, -beta, -alpha, ply + 1, is_pv_node)
+            else:
+                reduction = LATE_MOVE_REDUCTION if options.late_move_reductions and is_quiet and \
+                    depth >= LATE_MOVE_MIN_DEPTH and index >= LATE_MOVE_FIRST_INDEX else 0
+                if options.principal_variation:
+                    score = -self._negamax(child, depth - 1 - reduction, -alpha - 1, -alpha, ply + 1, False)
+                    if reduction and score > alpha:
+                        score = -self._negamax(child, depth - 1, -alpha - 1, -alpha, ply + 1, False)
+                    if alpha < score < beta:
+                        score = -self._negamax(child, depth - 1, -beta, -alpha, ply + 1, is_pv_node)
+                else:
+                    score = -self._negamax(child, depth - 1 - reduction, -beta, -alpha, ply + 1, False)
+                    if reduction and score > alpha:
+                        score = -self._negamax(child, depth - 1, -beta, -alpha, ply + 1, False)
+            searched += 1
+
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        # No legal move was searched, so unless one was skipped by futility pruning, the game is over
+        if searched == 0 and not board.has_legal_move(player, in_check):
+            return -(MATE_SCORE - ply) if in_check else 0
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.store(key, best_move, score_to_table(best_score, ply), depth, bound)
+        return best_score
+
+    @staticmethod
+    def generate_moves(board):
+        """
+        Lists the moves available to the player whose turn it is, with captures of the most valuable pieces first.
+        """
+        buffer = new_move_buffer()
+        count = generate_moves(board, buffer)
+        order_moves(board, buffer, count)
+        return [decode_move(buffer[index]) for index in range(count)]
+
+    @staticmethod
+    def generate_legal_moves(board):
+        """
+        Lists the moves available to the player whose turn it is which do not leave their king attacked, in the same
+        order as `generate_moves`.
+        """
+        player = board.current_player
+        legal_moves = []
+        for move in Bot.generate_moves(board):
+            child = board.clone()
+            child.move_piece(move.from_square, move.to_square)
+            if not child.is_in_check(player):
+                legal_moves.append(move)
+        return legal_moves
+
+    @staticmethod
+    def make_move(board, move):
+        """
+        Returns a copy of the board with the given 16-bit move played on it, leaving the original board untouched.
+        """
+        child = board.clone()
+        child.move_piece(SQUARES[move & 0x3F], SQUARES[move >> 6 & 0x3F])
+        return child
+
+    @staticmethod
+    def make_null_move(board):
+        """
+        Returns a copy of the board with the turn passed to the opponent without moving a piece. Earlier positions are
+        forgotten, so that positions either side of the null move are not taken for repetitions.
+        """
+        child = board.clone()
+        child.current_player = board.current_player.opponent()
+        child.en_passant_state = None
+        child.hash_history = None
+        return child
+
+    @staticmethod
+    def evaluate(board):
+        """
+        Scores the board in centipawns, from the point of view of the player whose turn it is.
+        """
+        return board.evaluate()
+
+
+class Ponderer:
+    """
+    Searches on the opponent's time. While the opponent is thinking, the bot searches the position after the reply
+    it expects them to play. If they play it, that search carries on as the bot's real search, with a head start;
+    if they play something else, it is abandoned, though what it found stays in the transposition table.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.hits = 0
+        self.misses = 0
+        self.expected_move = None
+        self._position_hash = None
+        self._time_manager = None
+        self._thread = None
+        self._result = None
+
+    def is_pondering(self):
+        return self._thread is not None
+
+    def get_expected_move(self, board):
+        """
+        The move the last search expects to be played on the board, from the transposition table, or None.
+        """
+        entry = self.bot.table.probe(board.get_position_hash())
+        if entry is None or not entry.move:
+            return None
+        buffer = new_move_buffer()
+        count = generate_moves(board, buffer)
+        return decode_move(entry.move) if entry.move in buffer[:count] else None
+
+    def start(self, board):
+        """
+        Starts searching the position after the opponent's expected reply, if there is one, on a background thread.
+        The board is the position with the opponent to move; it is not changed. Returns the expected move.
+        """
+        self.stop()
+        self.expected_move = self.get_expected_move(board)
+        if self.expected_move is None:
+            return None
+
+        position = board.clone()
+        position.move_piece(self.expected_move.from_square, self.expected_move.to_square)
+        self._position_hash = position.get_position_hash()
+        self._result = None
+
+        # Started here rather than on the thread, so that a search straight away can change the budget
+        self._time_manager = TimeManager()
+        self._time_manager.start()
+        self._thread = threading.Thread(target=self._ponder, args=(position, self._time_manager), daemon=True)
+        self._thread.start()
+        return self.expected_move
+
+    def wait(self):
+        """
+        Waits for the search on the opponent's time to finish by itself, which it does once it reaches the bot's
+        maximum depth.
+        """
+        if self._thread is not None:
+            self._thread.join()
+
+    def _ponder(self, board, time_manager):
+        self._result = self.bot.search(board, time_manager)
+
+    def search(self, board, time_manager=None):
+        """
+        Searches the board for real, once the opponent has moved. If the opponent played the expected move, the
+        search already under way is given the time manager's budget and carried on; otherwise it is stopped and a new
+        search is started.
+        """
+        time_manager = time_manager if time_manager is not None else TimeManager()
+        if self._thread is not None and board.get_position_hash() == self._position_hash:
+            self.hits += 1
+            pondering = self._time_manager
+
+            # From now on, cancelling the caller's time manager stops the search
+            pondering.stop_event = time_manager.stop_event
+            pondering.set_budget(time_manager.budget)
+            self._thread.join()
+            self._thread = None
+            self.expected_move = None
+            return self._result
+
+        if self._thread is not None:
+            self.misses += 1
+        self.stop()
+        return self.bot.search(board, time_manager)
+
+    def stop(self):
+        """
+        Abandons the search on the opponent's time, if there is one.
+        """
+        if self._thread is None:
+            return
+        self._time_manager.cancel()
+        self._thread.join()
+        self._thread = None
+        self.expected_move = None
+
+
+class HelperPool:
+    """
+    The helper processes of a bot searching with Lazy SMP. They are started once, and then wait between searches
+    for the next position to search, so that a search does not pay for starting processes.
+    """
+
+    def __init__(self, count, table, options):
+        import multiprocessing
+        self.stop_event = multiprocessing.Event()
+        self.finished = multiprocessing.Queue()
+        self.task_queues = []
+        self.processes = []
+        for index in range(count):
+            # Stagger the helpers' depths, so that they are not all searching the same tree in the same order
+            start_depth = 1 + (index + 1) % 2
+            task_queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=run_helper, daemon=True, args=(
+                table.name, table.entries, start_depth, task_queue, self.finished, self.stop_event, options))
+            process.start()
+            self.task_queues.append(task_queue)
+            self.processes.append(process)
+
+    def start(self, board, max_depth):
+        """
+        Sets every helper searching the board.
+        """
+        self.stop_event.clear()
+        for task_queue in self.task_queues:
+            task_queue.put((board, max_depth))
+
+    def stop(self):
+        """
+        Tells the helpers to stop searching, and waits until they all have.
+        """
+        self.stop_event.set()
+        for _ in self.task_queues:
+            self.finished.get()
+
+    def close(self):
+        for task_queue in self.task_queues:
+            task_queue.put(None)
+        for process in self.processes:
+            process.join()
+
+
+def order_moves(board, moves, count):
+    """
+    Reorders the first `count` moves of the buffer in place so that captures come first, most valuable victim first.
+    """
+    captures = 0
+    for index in range(count):
+        move = moves[index]
+        if not move_flags(move) & CAPTURE:
+            continue
+        value = _get_victim_value(board, move)
+        moves[index] = moves[captures]
+        position = captures
+        while position > 0 and _get_victim_value(board, moves[position - 1]) < value:
+            moves[position] = moves[position - 1]
+            position -= 1
+        moves[position] = move
+        captures += 1
+
+
+def move_ranked_to_front(moves, ranked):
+    """
+    Reorders the list of root moves so that the ranked moves come first, in their ranked order.
+    """
+    for move, _ in reversed(ranked):
+        moves.remove(move)
+        moves.insert(0, move)
+
+
+def move_to_front(moves, count, move):
+    """
+    Moves the given move to the front of the buffer, if it is among the first `count` moves, keeping the rest in order.
+    """
+    for index in range(count):
+        if moves[index] == move:
+            while index > 0:
+                moves[index] = moves[index - 1]
+                index -= 1
+            moves[0] = move
+            return
+
+
+def score_to_table(score, ply):
+    """
+    Converts a score found `ply` plies from the root into one to store in the transposition table, counting a mate
+    from the position rather than from the root.
+    """
+    if score >= MATE_THRESHOLD:
+        return score + ply
+    if score <= -MATE_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_table(score, ply):
+    """
+    Converts a score stored in the transposition table back into one for a position `ply` plies from the root.
+    """
+    if score >= MATE_THRESHOLD:
+        return score - ply
+    if score <= -MATE_THRESHOLD:
+        return score + ply
+    return score
+
+
+def run_helper(table_name, table_entries, start_depth, task_queue, finished, stop_event, options=None):
+    """
+    The entry point of a helper process. For each (board, max_depth) taken from the task queue, it searches the board
+    until told to stop, sharing its results with the main search through the shared transposition table, and then
+    reports that it has finished. It exits when it takes None from the queue.
+    """
+    table = TranspositionTable.attach(table_name, table_entries)
+    try:
+        bot = Bot(table=table, options=options)
+        for board, max_depth in iter(task_queue.get, None):
+            try:
+                time_manager = TimeManager(stop_event=stop_event)
+                time_manager.start()
+                bot._iterative_deepening(board, time_manager, max_depth, start_depth)
+            finally:
+                finished.put(start_depth)
+    finally:
+        table.close()
+
+
+def _get_victim_value(board, move):
+    victim_square = SQUARES[move_to(move)]
+    if board.is_square_empty(victim_square):
+        return EN_PASSANT_VICTIM_VALUE
+    return board.get_move_points(victim_square)
@@ -5,6 +5,9 @@ Data classes for easy representation of concepts such as a square on the board o
 from collections import namedtuple
 from enum import Enum, auto
 
+FILES = 'abcdefgh'
+
+
 class Player(Enum):
     """
     The two players in a game of chess.
@@ -17,6 +20,22 @@ class Player(Enum):
         else: return Player.WHITE
 
 
+class GameState(Enum):
+    """
+    Whether the game is still going on, from the point of view of the player whose turn it is, or how it ended.
+    As moves are not checked for legality, a game can also end with a king being captured.
+    """
+    IN_PROGRESS = auto()
+    CHECK = auto()
+    CHECKMATE = auto()
+    STALEMATE = auto()
+    REPETITION = auto()
+    KING_CAPTURED = auto()
+
+    def is_over(self):
+        return self not in (GameState.IN_PROGRESS, GameState.CHECK)
+
+
 class Square(namedtuple('Square', 'row col')):
     """
     An immutable pair (row, col) representing the coordinates of a square.
@@ -27,4 +46,37 @@ class Square(namedtuple('Square', 'row col')):
         """
         Creates a square at the given row and column.
         """
-        return Square(row=row, col=col)
\ No newline at end of file
+        return Square(row=row, col=col)
+
+    @staticmethod
+    def from_algebraic(name):
+        """
+        Creates a square from its name in algebraic notation, such as 'e4'.
+        """
+        return Square(row=int(name[1]) - 1, col=FILES.index(name[0]))
+
+    def to_algebraic(self):
+        return FILES[self.col] + str(self.row + 1)
+
+
+class Move(namedtuple('Move', 'from_square to_square')):
+    """
+    An immutable pair of squares describing a piece moving from one square to another.
+    """
+
+    @staticmethod
+    def between(from_square, to_square):
+        """
+        Creates a move between the two given squares.
+        """
+        return Move(from_square=from_square, to_square=to_square)
+
+    @staticmethod
+    def from_uci(text):
+        """
+        Creates a move from its long algebraic form, as used by UCI, such as 'e2e4'.
+        """
+        return Move(from_square=Square.from_algebraic(text[0:2]), to_square=Square.from_algebraic(text[2:4]))
+
+    def to_uci(self):
+        return self.from_square.to_algebraic() + self.to_square.to_algebraic()
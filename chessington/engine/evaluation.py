@@ -0,0 +1,153 @@
+"""
+Tables for scoring a position: the value of each piece, and piece-square tables giving a bonus or penalty for a
+piece standing on each square, in the middlegame and in the endgame.
+
+Scores are in centipawns. The tables below are written from white's point of view, with rank 8 at the top, so that
+they look like the board; black's tables are the same tables flipped top to bottom. The tables the engine looks
+scores up in are built from these on first use, by `get_evaluation_tables`.
+"""
+
+from collections import namedtuple
+
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King, PIECE_TYPES
+from chessington.engine.tables import lazy_table
+
+PIECE_POINTS = {Pawn: 1, Knight: 3, Bishop: 3, Rook: 5, Queen: 9, King: 15}
+CENTIPAWNS_PER_POINT = 100
+
+PHASE_WEIGHTS = {Pawn: 0, Knight: 1, Bishop: 1, Rook: 2, Queen: 4, King: 0}
+TOTAL_PHASE = 24
+
+PAWN_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0
+]
+
+PAWN_ENDGAME_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    80, 80, 80, 80, 80, 80, 80, 80,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    30, 30, 30, 30, 30, 30, 30, 30,
+    20, 20, 20, 20, 20, 20, 20, 20,
+    10, 10, 10, 10, 10, 10, 10, 10,
+    0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0
+]
+
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50
+]
+
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20
+]
+
+ROOK_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0
+]
+
+QUEEN_TABLE = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20
+]
+
+KING_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20
+]
+
+KING_ENDGAME_TABLE = [
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10, 0, 0, -10, -20, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 30, 40, 40, 30, -10, -30,
+    -30, -10, 20, 30, 30, 20, -10, -30,
+    -30, -30, 0, 0, 0, 0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50
+]
+
+MIDDLEGAME_TABLES = {Pawn: PAWN_TABLE, Knight: KNIGHT_TABLE, Bishop: BISHOP_TABLE, Rook: ROOK_TABLE,
+                     Queen: QUEEN_TABLE, King: KING_TABLE}
+ENDGAME_TABLES = {Pawn: PAWN_ENDGAME_TABLE, Knight: KNIGHT_TABLE, Bishop: BISHOP_TABLE, Rook: ROOK_TABLE,
+                  Queen: QUEEN_TABLE, King: KING_ENDGAME_TABLE}
+
+
+def _white_square_scores(table):
+    """
+    Reorders a table written with rank 8 at the top into square index order (row * 8 + col, with row 0 as rank 1).
+    """
+    return [table[(7 - index // 8) * 8 + index % 8] for index in range(64)]
+
+
+def _black_square_scores(table):
+    return [-table[(index // 8) * 8 + index % 8] for index in range(64)]
+
+
+class EvaluationTables(namedtuple('EvaluationTables', 'material middlegame endgame phases')):
+    """
+    The scores of each piece index (see `get_piece_index`), and of each piece index on each square, with the weight
+    of each piece index in the game phase. Scores are positive for white and negative for black, so that a position's
+    score from white's point of view is just their sum.
+    """
+    pass
+
+
+@lazy_table
+def get_evaluation_tables():
+    material = [PIECE_POINTS[piece_type] * CENTIPAWNS_PER_POINT for piece_type in PIECE_TYPES] + \
+               [-PIECE_POINTS[piece_type] * CENTIPAWNS_PER_POINT for piece_type in PIECE_TYPES]
+    middlegame = [_white_square_scores(MIDDLEGAME_TABLES[piece_type]) for piece_type in PIECE_TYPES] + \
+                 [_black_square_scores(MIDDLEGAME_TABLES[piece_type]) for piece_type in PIECE_TYPES]
+    endgame = [_white_square_scores(ENDGAME_TABLES[piece_type]) for piece_type in PIECE_TYPES] + \
+              [_black_square_scores(ENDGAME_TABLES[piece_type]) for piece_type in PIECE_TYPES]
+    phases = [PHASE_WEIGHTS[piece_type] for piece_type in PIECE_TYPES] * 2
+    return EvaluationTables(material, middlegame, endgame, phases)
+
+
+def taper(middlegame, endgame, phase):
+    """
+    Blends middlegame and endgame scores by the game phase, which runs from TOTAL_PHASE with all the pieces on the
+    board down to 0 with only kings and pawns left.
+    """
+    phase = min(phase, TOTAL_PHASE)
+    return (middlegame * phase + endgame * (TOTAL_PHASE - phase)) // TOTAL_PHASE
@@ -0,0 +1,88 @@
+"""
+A bounded cache of the moves available in recently seen positions, for callers such as the GUI which ask for the
+moves of the same positions again and again.
+
+Positions are keyed by their Zobrist hash and the player to move. `Board.set_piece` and `Board.move_piece` keep the
+hash up to date, so a board which has changed is simply looked up under a different key, and a cached move list is
+never used for a position it was not generated for.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from chessington.engine.moves import SQUARES, generate_moves, new_move_buffer
+
+DEFAULT_CAPACITY = 4096
+
+
+class CacheStats(namedtuple('CacheStats', 'hits misses evictions size capacity')):
+    """
+    How often lookups found a cached position, how many positions have been evicted to stay within the capacity,
+    and how many positions are cached now.
+    """
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MoveCache:
+    """
+    A least recently used cache of the moves available in up to `capacity` positions.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError('The capacity must be at least one position')
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._positions = OrderedDict()
+        self._buffer = new_move_buffer()
+        self._lock = threading.Lock()
+
+    def get_moves(self, board):
+        """
+        The moves available to the player whose turn it is, as a dictionary from each square which can be moved from
+        to a tuple of the squares it can be moved to.
+        """
+        key = (board.get_position_hash(), board.current_player)
+        with self._lock:
+            moves = self._positions.get(key)
+            if moves is not None:
+                self._positions.move_to_end(key)
+                self.hits += 1
+                return moves
+
+            self.misses += 1
+            moves = self._generate(board)
+            self._positions[key] = moves
+            if len(self._positions) > self.capacity:
+                self._positions.popitem(last=False)
+                self.evictions += 1
+            return moves
+
+    def get_available_moves(self, board, square):
+        """
+        The squares the piece on the given square can move to, which are none unless it is that piece's turn.
+        """
+        return self.get_moves(board).get(square, ())
+
+    def _generate(self, board):
+        count = generate_moves(board, self._buffer)
+        moves = {}
+        for index in range(count):
+            move = self._buffer[index]
+            moves.setdefault(SQUARES[move & 0x3F], []).append(SQUARES[move >> 6 & 0x3F])
+        return {from_square: tuple(to_squares) for from_square, to_squares in moves.items()}
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._positions), self.capacity)
+
+    def clear(self):
+        with self._lock:
+            self._positions.clear()
+            self.hits = self.misses = self.evictions = 0
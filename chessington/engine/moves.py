@@ -0,0 +1,239 @@
+"""
+Compact move generation for the bot's search.
+
+A move is packed into a 16-bit integer: the index (row * 8 + col) of the square moved from in the low 6 bits, the
+index of the square moved to in the next 6 bits, and flags describing the move in the top 4 bits. Moves are
+generated into preallocated `array('H')` buffers, one per ply of the search, so that searching creates no move
+objects or lists. `Move` objects are only created when a move leaves the search, by `decode_move`.
+
+The moves generated are exactly those the pieces' `get_available_moves` would return.
+"""
+
+from array import array
+from collections import namedtuple
+
+from chessington.engine.board import BOARD_SIZE
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.tables import lazy_table
+
+NUMBER_OF_SQUARES = BOARD_SIZE * BOARD_SIZE
+MAX_MOVES = 320
+
+CAPTURE = 1
+PROMOTION = 2
+EN_PASSANT = 4
+DOUBLE_PAWN_PUSH = 8
+
+SQUARES = [Square.at(index // BOARD_SIZE, index % BOARD_SIZE) for index in range(NUMBER_OF_SQUARES)]
+
+KNIGHT_VECTORS = [(2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1)]
+KING_VECTORS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (-1, -1), (1, -1)]
+ROOK_VECTORS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+BISHOP_VECTORS = [(1, 1), (-1, 1), (-1, -1), (1, -1)]
+
+
+def _targets(vectors, index):
+    row, col = divmod(index, BOARD_SIZE)
+    return tuple((row + row_step) * BOARD_SIZE + col + col_step for row_step, col_step in vectors
+                 if 0 <= row + row_step < BOARD_SIZE and 0 <= col + col_step < BOARD_SIZE)
+
+
+def _rays(vectors, index):
+    row, col = divmod(index, BOARD_SIZE)
+    rays = []
+    for row_step, col_step in vectors:
+        ray = []
+        next_row, next_col = row + row_step, col + col_step
+        while 0 <= next_row < BOARD_SIZE and 0 <= next_col < BOARD_SIZE:
+            ray.append(next_row * BOARD_SIZE + next_col)
+            next_row, next_col = next_row + row_step, next_col + col_step
+        if ray:
+            rays.append(tuple(ray))
+    return tuple(rays)
+
+
+class MoveTables(namedtuple('MoveTables', 'knight_targets king_targets rook_rays bishop_rays queen_rays')):
+    """
+    For each square index, the squares a knight or king there could move to, and the rays of squares a rook, bishop
+    or queen there could slide along, nearest square first.
+    """
+    pass
+
+
+@lazy_table
+def get_move_tables():
+    knight_targets = [_targets(KNIGHT_VECTORS, index) for index in range(NUMBER_OF_SQUARES)]
+    king_targets = [_targets(KING_VECTORS, index) for index in range(NUMBER_OF_SQUARES)]
+    rook_rays = [_rays(ROOK_VECTORS, index) for index in range(NUMBER_OF_SQUARES)]
+    bishop_rays = [_rays(BISHOP_VECTORS, index) for index in range(NUMBER_OF_SQUARES)]
+    queen_rays = [rook_rays[index] + bishop_rays[index] for index in range(NUMBER_OF_SQUARES)]
+    return MoveTables(knight_targets, king_targets, rook_rays, bishop_rays, queen_rays)
+
+
+# The tables by piece type, which are looked up by `_load_tables` the first time moves are generated
+LEAPER_TARGETS = None
+SLIDER_RAYS = None
+
+
+def _load_tables():
+    global LEAPER_TARGETS, SLIDER_RAYS
+    tables = get_move_tables()
+    SLIDER_RAYS = {Bishop: tables.bishop_rays, Rook: tables.rook_rays, Queen: tables.queen_rays}
+    LEAPER_TARGETS = {Knight: tables.knight_targets, King: tables.king_targets}
+
+
+def encode_move(from_index, to_index, flags=0):
+    return from_index | to_index << 6 | flags << 12
+
+
+def move_from(move):
+    return move & 0x3F
+
+
+def move_to(move):
+    return move >> 6 & 0x3F
+
+
+def move_flags(move):
+    return move >> 12
+
+
+def decode_move(move):
+    """
+    Unpacks a 16-bit move into a `Move` between two squares.
+    """
+    return Move.between(SQUARES[move & 0x3F], SQUARES[move >> 6 & 0x3F])
+
+
+def might_expose_king(move, king_index):
+    """
+    Whether the move might leave the mover's king attacked, given that it is not attacked before the move. Only a
+    king move, an en passant capture or a move by a piece in line with the king, which might be pinned to it, can.
+    """
+    if move >> 12 & EN_PASSANT:
+        return True
+    from_index = move & 0x3F
+    row, col = from_index >> 3, from_index & 7
+    king_row, king_col = king_index >> 3, king_index & 7
+    return row == king_row or col == king_col or abs(row - king_row) == abs(col - king_col)
+
+
+def new_move_buffer():
+    return array('H', bytes(2 * MAX_MOVES))
+
+
+class MoveBuffers:
+    """
+    One preallocated move buffer for each ply of a search, so that a ply's moves survive while deeper plies are
+    being searched.
+    """
+
+    def __init__(self, max_ply):
+        self.buffers = [new_move_buffer() for _ in range(max_ply + 1)]
+
+    def __getitem__(self, ply):
+        return self.buffers[ply]
+
+
+def generate_moves(board, buffer, from_indices=None):
+    """
+    Writes the moves available to the player whose turn it is into the buffer, returning how many were written.
+    If square indices are given, only the moves of the pieces on those squares are written.
+    """
+    if LEAPER_TARGETS is None:
+        _load_tables()
+    squares = board.board
+    player = board.current_player
+    count = 0
+
+    # The buffer holds MAX_MOVES moves, which no position reached in a game comes near, but a position set up piece by
+    # piece could have more
+    try:
+        for from_index in range(NUMBER_OF_SQUARES) if from_indices is None else from_indices:
+            piece = squares[from_index >> 3][from_index & 7]
+            if piece is None or piece.player != player:
+                continue
+            piece_type = type(piece)
+
+            if piece_type is Pawn:
+                count = _generate_pawn_moves(board, from_index, player, buffer, count)
+
+            elif piece_type in LEAPER_TARGETS:
+                for to_index in LEAPER_TARGETS[piece_type][from_index]:
+                    target = squares[to_index >> 3][to_index & 7]
+                    if target is None:
+                        buffer[count] = from_index | to_index << 6
+                        count += 1
+                    elif target.player != player:
+                        buffer[count] = from_index | to_index << 6 | CAPTURE << 12
+                        count += 1
+
+            else:
+                for ray in SLIDER_RAYS[piece_type][from_index]:
+                    for to_index in ray:
+                        target = squares[to_index >> 3][to_index & 7]
+                        if target is None:
+                            buffer[count] = from_index | to_index << 6
+                            count += 1
+                            continue
+                        if target.player != player:
+                            buffer[count] = from_index | to_index << 6 | CAPTURE << 12
+                            count += 1
+                        break
+    except IndexError:
+        raise ValueError('The position has more than the {} moves a move buffer can hold'.format(len(buffer))) from None
+
+    return count
+
+
+def _generate_pawn_moves(board, from_index, player, buffer, count):
+    squares = board.board
+    row, col = from_index >> 3, from_index & 7
+    direction, start_row = (1, 1) if player == Player.WHITE else (-1, 6)
+    next_row = row + direction
+    if not 0 <= next_row < BOARD_SIZE:
+        return count
+    promotion = PROMOTION if next_row == 0 or next_row == BOARD_SIZE - 1 else 0
+
+    if squares[next_row][col] is None:
+        buffer[count] = encode_move(from_index, next_row * BOARD_SIZE + col, promotion)
+        count += 1
+        if row == start_row and squares[next_row + direction][col] is None:
+            buffer[count] = encode_move(from_index, (next_row + direction) * BOARD_SIZE + col, DOUBLE_PAWN_PUSH)
+            count += 1
+
+    for next_col in (col + 1, col - 1):
+        if 0 <= next_col < BOARD_SIZE:
+            target = squares[next_row][next_col]
+            if target is not None and target.player != player:
+                buffer[count] = encode_move(from_index, next_row * BOARD_SIZE + next_col, CAPTURE | promotion)
+                count += 1
+
+    victim = board.en_passant_state
+    if victim is not None and victim.row == row and abs(victim.col - col) == 1:
+        buffer[count] = encode_move(from_index, next_row * BOARD_SIZE + victim.col, CAPTURE | EN_PASSANT)
+        count += 1
+
+    return count
+
+
+def perft(board, depth, buffers=None):
+    """
+    Counts the positions reached by playing every sequence of `depth` moves from the board, as a check that moves
+    are generated correctly and as a measure of how quickly.
+    """
+    if depth == 0:
+        return 1
+    buffers = buffers if buffers is not None else MoveBuffers(depth)
+    moves = buffers[depth]
+    count = generate_moves(board, moves)
+    if depth == 1:
+        return count
+    total = 0
+    for index in range(count):
+        move = moves[index]
+        child = board.clone()
+        child.move_piece(SQUARES[move & 0x3F], SQUARES[move >> 6 & 0x3F])
+        total += perft(child, depth - 1, buffers)
+    return total
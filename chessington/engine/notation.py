@@ -0,0 +1,48 @@
+"""
+Conversion of moves into standard algebraic notation, as used when recording games in PGN.
+"""
+
+from chessington.engine.board import BOARD_SIZE
+from chessington.engine.data import Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+PIECE_LETTERS = {Pawn: '', Knight: 'N', Bishop: 'B', Rook: 'R', Queen: 'Q', King: 'K'}
+
+
+def to_san(board, move):
+    """
+    Writes the move in standard algebraic notation, such as 'Nf3', 'exd5' or 'e8=Q', for the position on the
+    board before the move is played. Checks are not marked, as the board does not know about check.
+    """
+    piece = board.get_piece(move.from_square)
+    is_capture = not board.is_square_empty(move.to_square) or \
+        (isinstance(piece, Pawn) and move.from_square.col != move.to_square.col)
+
+    if isinstance(piece, Pawn):
+        san = move.from_square.to_algebraic()[0] + 'x' if is_capture else ''
+        san += move.to_square.to_algebraic()
+        if move.to_square.row in (0, BOARD_SIZE - 1):
+            san += '=Q'
+        return san
+
+    return PIECE_LETTERS[type(piece)] + _disambiguation(board, piece, move) + \
+        ('x' if is_capture else '') + move.to_square.to_algebraic()
+
+
+def _disambiguation(board, piece, move):
+    rivals = []
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            square = Square.at(row, col)
+            other = board.get_piece(square)
+            if other is not piece and type(other) is type(piece) and other.player == piece.player \
+                    and move.to_square in other.get_available_moves(board):
+                rivals.append(square)
+    if not rivals:
+        return ''
+    name = move.from_square.to_algebraic()
+    if all(square.col != move.from_square.col for square in rivals):
+        return name[0]
+    if all(square.row != move.from_square.row for square in rivals):
+        return name[1]
+    return name
@@ -0,0 +1,129 @@
+"""
+A compact, fixed-size binary encoding of a board, and a file of encoded positions which can be read back by index
+without reading the whole file.
+
+Each position takes 37 bytes: a 4-bit code for each of the 64 squares (0 for an empty square, otherwise one more than
+the piece's index), then a byte of flags for the player to move and whether there is an en passant square, a byte
+for the en passant square, a byte for the half-move clock and two bytes for the full-move number. Move counters too
+large for their bytes are stored as the largest value which fits.
+"""
+
+import mmap
+import os
+import struct
+
+from chessington.engine.board import Board, BOARD_SIZE
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import get_piece_index, create_piece_from_index
+
+POSITION_FORMAT = struct.Struct('<32sBBBH')
+POSITION_SIZE = POSITION_FORMAT.size
+
+BLACK_TO_MOVE = 1
+HAS_EN_PASSANT = 2
+MAX_HALFMOVE_CLOCK = 255
+MAX_FULLMOVE_NUMBER = 65535
+
+
+def encode_board(board):
+    """
+    Packs the board into POSITION_SIZE bytes.
+    """
+    squares = bytearray(BOARD_SIZE * BOARD_SIZE // 2)
+    for row in range(BOARD_SIZE):
+        for col in range(BOARD_SIZE):
+            piece = board.get_piece(Square.at(row, col))
+            if piece is not None:
+                index = row * BOARD_SIZE + col
+                squares[index >> 1] |= (get_piece_index(piece) + 1) << (4 * (index & 1))
+
+    flags = BLACK_TO_MOVE if board.current_player == Player.BLACK else 0
+    en_passant = 0
+    if board.en_passant_state is not None:
+        flags |= HAS_EN_PASSANT
+        en_passant = board.en_passant_state.row * BOARD_SIZE + board.en_passant_state.col
+
+    return POSITION_FORMAT.pack(bytes(squares), flags, en_passant, _clamp(board.halfmove_clock, MAX_HALFMOVE_CLOCK),
+                                _clamp(board.fullmove_number, MAX_FULLMOVE_NUMBER))
+
+
+def _clamp(value, maximum):
+    return max(0, min(value, maximum))
+
+
+def decode_board(data):
+    """
+    Unpacks a board from the bytes written by `encode_board`.
+    """
+    squares, flags, en_passant, halfmove_clock, fullmove_number = POSITION_FORMAT.unpack(data)
+    board = Board.empty()
+    for index in range(BOARD_SIZE * BOARD_SIZE):
+        code = squares[index >> 1] >> (4 * (index & 1)) & 0xF
+        if code:
+            board.set_piece(Square.at(index // BOARD_SIZE, index % BOARD_SIZE), create_piece_from_index(code - 1))
+
+    board.current_player = Player.BLACK if flags & BLACK_TO_MOVE else Player.WHITE
+    if flags & HAS_EN_PASSANT:
+        board.en_passant_state = Square.at(en_passant // BOARD_SIZE, en_passant % BOARD_SIZE)
+    board.halfmove_clock = halfmove_clock
+    board.fullmove_number = fullmove_number
+    return board
+
+
+class PositionStore:
+    """
+    A file of encoded positions. New positions are appended to the end of the file, and positions are read back
+    by index through a memory map, so only the pages holding the requested positions are read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a+b')
+        self._map = None
+
+    def __len__(self):
+        self._file.flush()
+        return os.fstat(self._file.fileno()).st_size // POSITION_SIZE
+
+    def __getitem__(self, index):
+        return decode_board(self.get_bytes(index))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, board):
+        """
+        Adds the board to the end of the store, and returns its index.
+        """
+        index = len(self)
+        self._file.write(encode_board(board))
+        return index
+
+    def extend(self, boards):
+        self._file.write(b''.join(encode_board(board) for board in boards))
+
+    def get_bytes(self, index):
+        """
+        Reads the encoded bytes of the position at the given index, without decoding them.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('There is no position at index {}'.format(index))
+
+        end = (index + 1) * POSITION_SIZE
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map[end - POSITION_SIZE:end]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -208,3 +208,22 @@ class King(Piece):
                                             move_vectors[vector][0], move_vectors[vector][1])
 
         return valid_moves
+
+
+PIECE_TYPES = [Pawn, Knight, Bishop, Rook, Queen, King]
+PIECE_TYPE_INDICES = {piece_type: index for index, piece_type in enumerate(PIECE_TYPES)}
+
+
+def get_piece_index(piece):
+    """
+    Numbers each kind of piece from 0 to 11: white pawn, knight, bishop, rook, queen and king, then the same for black.
+    """
+    return PIECE_TYPE_INDICES[type(piece)] + (0 if piece.player == Player.WHITE else len(PIECE_TYPES))
+
+
+def create_piece_from_index(index):
+    """
+    Creates a new piece of the kind numbered by `get_piece_index`.
+    """
+    player = Player.WHITE if index < len(PIECE_TYPES) else Player.BLACK
+    return PIECE_TYPES[index % len(PIECE_TYPES)](player)
@@ -0,0 +1,160 @@
+"""
+An on-disk index from positions to the games which reached them, for answering "which games reached this position?"
+across a large archive of games.
+
+The index is a file of fixed-size records of (position hash, game id, ply), sorted by hash, which is searched
+through a memory map. It is built with an external merge sort, so building it needs only enough memory for one
+chunk of records at a time, however many games are indexed.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from collections import namedtuple
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move
+
+RECORD_FORMAT = struct.Struct('<QIH')
+RECORD_SIZE = RECORD_FORMAT.size
+HASH_FORMAT = struct.Struct('<Q')
+DEFAULT_CHUNK_SIZE = 1000000
+READ_BUFFER_RECORDS = 4096
+
+
+class GamePosition(namedtuple('GamePosition', 'game_id ply')):
+    """
+    A position reached in a game: the game's id, and the number of plies played to reach the position.
+    """
+    pass
+
+
+def replay_positions(game_id, moves):
+    """
+    Replays a game, given as a list of moves in long algebraic notation such as 'e2e4', from the starting position,
+    yielding an index record for every position reached.
+    """
+    board = Board.at_starting_position()
+    yield board.get_position_hash(), game_id, 0
+    for ply, text in enumerate(moves, start=1):
+        move = Move.from_uci(text)
+        board.move_piece(move.from_square, move.to_square)
+        yield board.get_position_hash(), game_id, ply
+
+
+def build_index(games, path, chunk_size=DEFAULT_CHUNK_SIZE, temp_dir=None):
+    """
+    Builds an index at the given path from an iterable of (game id, moves) pairs. Records are sorted in chunks of
+    `chunk_size`, which are written to temporary files and then merged into the index.
+    """
+    run_paths = []
+    try:
+        chunk = []
+        for game_id, moves in games:
+            for record in replay_positions(game_id, moves):
+                chunk.append(record)
+                if len(chunk) >= chunk_size:
+                    run_paths.append(_write_run(chunk, temp_dir))
+                    chunk = []
+        if chunk or not run_paths:
+            run_paths.append(_write_run(chunk, temp_dir))
+
+        with open(path, 'wb') as index_file:
+            runs = [_read_run(run_path) for run_path in run_paths]
+            buffer = []
+            for record in heapq.merge(*runs):
+                buffer.append(RECORD_FORMAT.pack(*record))
+                if len(buffer) >= READ_BUFFER_RECORDS:
+                    index_file.write(b''.join(buffer))
+                    buffer = []
+            index_file.write(b''.join(buffer))
+    finally:
+        for run_path in run_paths:
+            os.remove(run_path)
+
+
+def _write_run(chunk, temp_dir):
+    chunk.sort()
+    file_descriptor, run_path = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with os.fdopen(file_descriptor, 'wb') as run_file:
+        run_file.write(b''.join(RECORD_FORMAT.pack(*record) for record in chunk))
+    return run_path
+
+
+def _read_run(run_path):
+    with open(run_path, 'rb') as run_file:
+        while True:
+            data = run_file.read(RECORD_SIZE * READ_BUFFER_RECORDS)
+            if not data:
+                return
+            yield from RECORD_FORMAT.iter_unpack(data)
+
+
+class PositionIndex:
+    """
+    A sorted index file built by `build_index`, opened for lookups.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self._length = size // RECORD_SIZE
+
+    def __len__(self):
+        return self._length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def lookup(self, position):
+        """
+        Finds every (game id, ply) at which the position was reached. The position may be a board or a position hash.
+        """
+        position_hash = position.get_position_hash() if isinstance(position, Board) else position
+        return self._lookup_from(position_hash, 0)[0]
+
+    def lookup_many(self, positions):
+        """
+        Looks up many positions at once, returning a dictionary from each position hash to its list of game positions.
+        The hashes are looked up in sorted order, so each search starts where the previous one finished.
+        """
+        hashes = sorted({position.get_position_hash() if isinstance(position, Board) else position
+                         for position in positions})
+        results = {}
+        start = 0
+        for position_hash in hashes:
+            results[position_hash], start = self._lookup_from(position_hash, start)
+        return results
+
+    def _lookup_from(self, position_hash, start):
+        index = self._bisect(position_hash, start)
+        matches = []
+        while index < self._length:
+            found_hash, game_id, ply = RECORD_FORMAT.unpack_from(self._map, index * RECORD_SIZE)
+            if found_hash != position_hash:
+                break
+            matches.append(GamePosition(game_id=game_id, ply=ply))
+            index += 1
+        return matches, index
+
+    def _bisect(self, position_hash, low):
+        high = self._length
+        while low < high:
+            middle = (low + high) // 2
+            if HASH_FORMAT.unpack_from(self._map, middle * RECORD_SIZE)[0] < position_hash:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
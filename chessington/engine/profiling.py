@@ -0,0 +1,185 @@
+"""
+Opt-in profiling of the engine's entry points.
+
+When enabled, move generation (`get_available_moves` on each piece, and the bot's `generate_moves`),
+`Board.move_piece` and `Bot.search` are wrapped to count calls and total time with `time.perf_counter_ns`. Each bot
+search can also capture a `cProfile` profile or a `tracemalloc` snapshot. Results are written as JSON, and as a
+collapsed-stack file (one "outer;inner time" line per call stack) which flame graph tools can read.
+
+Profiling is enabled either by calling `enable`, or by setting the CHESSINGTON_PROFILE environment variable before
+the engine is imported: to '1' for call counts and timings only, or to 'cprofile' or 'tracemalloc' to also capture a
+profile or snapshot per bot search. Results are written to the directory named by CHESSINGTON_PROFILE_DIR (default:
+the current directory) when the process exits.
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from chessington.engine import bot
+from chessington.engine.board import Board
+from chessington.engine.pieces import PIECE_TYPES
+
+PROFILE_VARIABLE = 'CHESSINGTON_PROFILE'
+PROFILE_DIRECTORY_VARIABLE = 'CHESSINGTON_PROFILE_DIR'
+REPORT_NAME = 'chessington-profile'
+
+CPROFILE = 'cprofile'
+TRACEMALLOC = 'tracemalloc'
+
+_profiler = None
+
+
+class Profiler:
+    """
+    Collects call counts and times for the wrapped functions, per function and per call stack.
+    """
+
+    def __init__(self, capture=None, output_dir='.'):
+        if capture not in (None, CPROFILE, TRACEMALLOC):
+            raise ValueError('Unknown capture mode: {}'.format(capture))
+        self.capture = capture
+        self.output_dir = output_dir
+        self.calls = {}
+        self.total_ns = {}
+        self.stack_ns = {}
+        self.searches = 0
+        self._local = threading.local()
+        self._originals = []
+
+    def install(self):
+        for piece_type in PIECE_TYPES:
+            self._wrap(piece_type, 'get_available_moves', piece_type.__name__ + '.get_available_moves')
+        self._wrap(Board, 'move_piece', 'Board.move_piece')
+        self._wrap(bot, 'generate_moves', 'generate_moves')
+        self._wrap(bot.Bot, 'search', 'Bot.search', capture=True)
+
+    def uninstall(self):
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals = []
+
+    def _wrap(self, owner, attribute, name, capture=False):
+        original = owner.__dict__[attribute]
+        profiler = self
+
+        def wrapper(*args, **kwargs):
+            if capture and profiler.capture is not None:
+                return profiler._call_with_capture(name, original, args, kwargs)
+            return profiler._call(name, original, args, kwargs)
+
+        wrapper.__name__ = original.__name__
+        wrapper.__doc__ = original.__doc__
+        self._originals.append((owner, attribute, original))
+        setattr(owner, attribute, wrapper)
+
+    def _call(self, name, function, args, kwargs):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        # Each frame is [name, time spent in the functions it called]
+        frame = [name, 0]
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.total_ns[name] = self.total_ns.get(name, 0) + elapsed
+            path = ';'.join([outer[0] for outer in stack] + [name])
+            self.stack_ns[path] = self.stack_ns.get(path, 0) + elapsed - frame[1]
+
+    def _call_with_capture(self, name, function, args, kwargs):
+        self.searches += 1
+        path = os.path.join(self.output_dir, 'search-{}'.format(self.searches))
+
+        if self.capture == CPROFILE:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return self._call(name, function, args, kwargs)
+            finally:
+                profile.disable()
+                profile.dump_stats(path + '.prof')
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        try:
+            return self._call(name, function, args, kwargs)
+        finally:
+            tracemalloc.take_snapshot().dump(path + '.tracemalloc')
+            if started_tracing:
+                tracemalloc.stop()
+
+    def to_json(self):
+        return {
+            name: {'calls': self.calls[name], 'total_ns': self.total_ns[name],
+                   'mean_ns': self.total_ns[name] / self.calls[name]}
+            for name in sorted(self.calls)
+        }
+
+    def to_collapsed_stacks(self):
+        """
+        The time spent in each call stack, excluding time spent in the wrapped functions it called, in the
+        "outer;inner value" format read by flame graph tools.
+        """
+        return ''.join('{} {}\n'.format(path, ns) for path, ns in sorted(self.stack_ns.items()))
+
+    def dump(self, path_prefix=None):
+        """
+        Writes the results to <path_prefix>.json and <path_prefix>.collapsed.
+        """
+        path_prefix = path_prefix or os.path.join(self.output_dir, REPORT_NAME)
+        with open(path_prefix + '.json', 'w') as json_file:
+            json.dump(self.to_json(), json_file, indent=2)
+        with open(path_prefix + '.collapsed', 'w') as collapsed_file:
+            collapsed_file.write(self.to_collapsed_stacks())
+
+
+def enable(capture=None, output_dir='.'):
+    """
+    Starts profiling the engine, returning the profiler which collects the results.
+    """
+    global _profiler
+    disable()
+    _profiler = Profiler(capture, output_dir)
+    _profiler.install()
+    return _profiler
+
+
+def disable():
+    """
+    Stops profiling, restoring the engine's functions, and returns the profiler which was running, if any.
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.uninstall()
+    return profiler
+
+
+def get_profiler():
+    return _profiler
+
+
+def enable_from_environment():
+    """
+    Enables profiling if the CHESSINGTON_PROFILE environment variable is set, writing the results on exit.
+    """
+    mode = os.environ.get(PROFILE_VARIABLE)
+    if not mode or mode == '0':
+        return None
+    capture = mode if mode in (CPROFILE, TRACEMALLOC) else None
+    profiler = enable(capture, os.environ.get(PROFILE_DIRECTORY_VARIABLE, '.'))
+    atexit.register(profiler.dump)
+    return profiler
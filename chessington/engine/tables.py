@@ -0,0 +1,29 @@
+"""
+Lazily built lookup tables.
+
+The engine's precomputed tables (hash keys, move targets and rays, piece-square scores) are not built when their
+modules are imported, but on first use, through a function made by `lazy_table`.
+"""
+
+import functools
+import threading
+
+_lock = threading.RLock()
+
+
+def lazy_table(build):
+    """
+    Decorates a function which builds a table, turning it into one which returns the table, building it only the
+    first time it is called.
+    """
+    table = []
+
+    @functools.wraps(build)
+    def get_table():
+        if not table:
+            with _lock:
+                if not table:
+                    table.append(build())
+        return table[0]
+
+    return get_table
@@ -0,0 +1,113 @@
+"""
+A transposition table: a fixed-size hash table of search results, keyed by position hash, so that a position reached
+again by a different move order does not have to be searched again.
+
+The table is a flat array of 16-byte entries, which can live in an ordinary `bytearray` or in a block of
+`multiprocessing.shared_memory` shared between several searching processes. Entries are written without locks:
+each entry stores its data alongside the position hash XORed with that data, so an entry that was torn by two
+processes writing at once no longer matches its hash, and is ignored.
+"""
+
+import struct
+from collections import namedtuple
+
+ENTRY_FORMAT = struct.Struct('<QQ')
+ENTRY_SIZE = ENTRY_FORMAT.size
+DEFAULT_TABLE_ENTRIES = 1 << 16
+
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+SCORE_OFFSET = 1 << 31
+MAX_DEPTH = 0xFF
+
+
+class TableEntry(namedtuple('TableEntry', 'move score depth bound')):
+    """
+    A stored search result: the best 16-bit move found, its score, the depth searched, and whether the score is
+    exact or only a lower or upper bound on the true score.
+    """
+    pass
+
+
+def pack_entry(move, score, depth, bound):
+    return move | (score + SCORE_OFFSET) << 16 | min(depth, MAX_DEPTH) << 48 | bound << 56
+
+
+def unpack_entry(data):
+    return TableEntry(move=data & 0xFFFF, score=(data >> 16 & 0xFFFFFFFF) - SCORE_OFFSET, depth=data >> 48 & 0xFF,
+                      bound=data >> 56 & 0x3)
+
+
+class TranspositionTable:
+    """
+    A transposition table of `entries` entries, which must be a power of two. Use `create_shared` and `attach` for a
+    table shared between processes.
+    """
+
+    def __init__(self, entries=DEFAULT_TABLE_ENTRIES, buffer=None, shared_memory_block=None):
+        if entries & (entries - 1):
+            raise ValueError('The number of entries must be a power of two')
+        self.entries = entries
+        self.mask = entries - 1
+        self.buffer = buffer if buffer is not None else bytearray(entries * ENTRY_SIZE)
+        self.shared_memory_block = shared_memory_block
+
+    @staticmethod
+    def create_shared(entries=DEFAULT_TABLE_ENTRIES):
+        """
+        Creates a table in a new block of shared memory, which other processes can `attach` to by its name.
+        """
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(create=True, size=entries * ENTRY_SIZE)
+        block.buf[:] = bytes(entries * ENTRY_SIZE)
+        return TranspositionTable(entries, block.buf, block)
+
+    @staticmethod
+    def attach(name, entries):
+        """
+        Opens a table created by `create_shared` in another process.
+        """
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(name=name)
+        return TranspositionTable(entries, block.buf, block)
+
+    @property
+    def name(self):
+        return self.shared_memory_block.name if self.shared_memory_block is not None else None
+
+    def store(self, key, move, score, depth, bound):
+        """
+        Stores a search result, replacing the existing entry unless it is for the same position at a greater depth.
+        """
+        offset = (key & self.mask) * ENTRY_SIZE
+        checked_key, data = ENTRY_FORMAT.unpack_from(self.buffer, offset)
+        if data and checked_key ^ data == key and data >> 48 & 0xFF > depth:
+            return
+        data = pack_entry(move, score, depth, bound)
+        ENTRY_FORMAT.pack_into(self.buffer, offset, key ^ data, data)
+
+    def probe(self, key):
+        """
+        Looks up the stored result for the position with the given hash, or returns None if there is none.
+        """
+        checked_key, data = ENTRY_FORMAT.unpack_from(self.buffer, (key & self.mask) * ENTRY_SIZE)
+        if not data or checked_key ^ data != key:
+            return None
+        return unpack_entry(data)
+
+    def clear(self):
+        self.buffer[:] = bytes(self.entries * ENTRY_SIZE)
+
+    def close(self, unlink=False):
+        """
+        Releases a shared table. The process which created it should also unlink it, once no process needs it.
+        """
+        if self.shared_memory_block is None:
+            return
+        self.buffer = None
+        self.shared_memory_block.close()
+        if unlink:
+            self.shared_memory_block.unlink()
+        self.shared_memory_block = None
@@ -0,0 +1,33 @@
+"""
+Zobrist hashing: random 64-bit keys for each piece on each square, which are XORed together to give a hash of a
+position that can be updated cheaply as pieces move.
+
+The keys are built on first use, by `get_zobrist_keys`.
+"""
+
+import random
+from collections import namedtuple
+
+from chessington.engine.tables import lazy_table
+
+ZOBRIST_SEED = 20190214
+NUMBER_OF_SQUARES = 64
+NUMBER_OF_PIECE_INDICES = 12
+
+
+class ZobristKeys(namedtuple('ZobristKeys', 'piece_square black_to_move en_passant')):
+    """
+    The keys for each piece index (see `get_piece_index`) on each square, for black being the player to move, and
+    for a pawn which can be taken en passant on each square.
+    """
+    pass
+
+
+@lazy_table
+def get_zobrist_keys():
+    generator = random.Random(ZOBRIST_SEED)
+    piece_square = [[generator.getrandbits(64) for _ in range(NUMBER_OF_SQUARES)]
+                    for _ in range(NUMBER_OF_PIECE_INDICES)]
+    black_to_move = generator.getrandbits(64)
+    en_passant = [generator.getrandbits(64) for _ in range(NUMBER_OF_SQUARES)]
+    return ZobristKeys(piece_square, black_to_move, en_passant)
@@ -0,0 +1,237 @@
+"""
+A headless harness which plays the bot against itself many times over, across a pool of processes, writing the
+games out as PGN along with the time taken and nodes searched for every move.
+
+Run with ``poetry run chessington-selfplay --help`` for the available options.
+"""
+
+import argparse
+import json
+import multiprocessing
+from collections import namedtuple
+
+from chessington.engine.board import Board
+from chessington.engine.bot import Bot, TimeManager
+from chessington.engine.data import Player, Move, GameState
+from chessington.engine.notation import to_san
+
+DEFAULT_MAX_PLIES = 200
+
+WHITE_WINS = '1-0'
+BLACK_WINS = '0-1'
+DRAW = '1/2-1/2'
+
+# The PGN termination of games which did not end in checkmate or the capture of a king
+TERMINATIONS = {GameState.STALEMATE: 'stalemate', GameState.REPETITION: 'repetition'}
+
+
+class TimeControl(namedtuple('TimeControl', 'base increment')):
+    """
+    The time each player starts with, and the time added after each of their moves, in seconds.
+    """
+
+    @staticmethod
+    def parse(text):
+        """
+        Reads a time control written as 'base+increment', such as '60+0.5', or just 'base'.
+        """
+        base, _, increment = text.partition('+')
+        return TimeControl(base=float(base), increment=float(increment or 0))
+
+    def __str__(self):
+        return '{:g}+{:g}'.format(self.base, self.increment)
+
+
+class GameSettings(namedtuple('GameSettings', 'game_id opening time_control max_depth max_plies')):
+    """
+    Everything a worker process needs to know to play one game.
+    """
+    pass
+
+
+def read_openings(path):
+    """
+    Reads openings from a file with one opening per line, each a space-separated list of moves such as 'e2e4 e7e5'.
+    Blank lines and lines starting with '#' are ignored. Raises ValueError if an opening has a move which cannot be
+    read or is not legal.
+    """
+    openings = []
+    with open(path) as openings_file:
+        for number, line in enumerate(openings_file, 1):
+            line = line.strip()
+            if line and not line.startswith('#'):
+                opening = line.split()
+                check_opening(opening, '{} line {}'.format(path, number))
+                openings.append(opening)
+    return openings
+
+
+def check_opening(opening, source):
+    """
+    Plays through an opening from the starting position, raising ValueError if one of its moves is not legal.
+    """
+    board = Board.at_starting_position()
+    for text in opening:
+        try:
+            move = Move.from_uci(text)
+        except (ValueError, IndexError):
+            move = None
+        if move not in Bot.generate_legal_moves(board):
+            raise ValueError('{}: {} is not a legal move in the opening {}'.format(source, text, ' '.join(opening)))
+        board.move_piece(move.from_square, move.to_square)
+
+
+def get_winner_by_capture(board):
+    """
+    The bot's moves are not checked for legality, so a game can also be won by capturing the opposing king.
+    """
+    if board.find_king(Player.WHITE) is None:
+        return Player.BLACK
+    if board.find_king(Player.BLACK) is None:
+        return Player.WHITE
+    return None
+
+
+def get_result(board, state):
+    """
+    The result of a game which has ended in the given state: a win for the player who gave checkmate or captured
+    the opposing king, and otherwise a draw.
+    """
+    if state == GameState.CHECKMATE:
+        winner = board.current_player.opponent()
+    elif state == GameState.KING_CAPTURED:
+        winner = get_winner_by_capture(board)
+    else:
+        return DRAW
+    return WHITE_WINS if winner == Player.WHITE else BLACK_WINS
+
+
+def play_game(settings):
+    """
+    Plays one game between two copies of the bot, returning a record of the game and every move in it.
+    """
+    board = Board.at_starting_position()
+    bot = Bot(max_depth=settings.max_depth)
+    clocks = {Player.WHITE: settings.time_control.base, Player.BLACK: settings.time_control.base}
+    moves = []
+    result = None
+    termination = 'normal'
+
+    for text in settings.opening:
+        move = Move.from_uci(text)
+        moves.append({'uci': text, 'san': to_san(board, move), 'book': True})
+        board.move_piece(move.from_square, move.to_square)
+
+    while result is None:
+        state = board.game_state()
+        if state.is_over():
+            result, termination = get_result(board, state), TERMINATIONS.get(state, termination)
+            break
+        if len(moves) >= settings.max_plies:
+            result, termination = DRAW, 'move limit'
+            break
+
+        player = board.current_player
+        time_manager = TimeManager.from_clock(clocks[player], settings.time_control.increment)
+        search = bot.search(board, time_manager)
+        if search.move is None:
+            result = DRAW
+            break
+
+        # A move made after the clock ran out is never played, as the game was already lost
+        clocks[player] -= search.elapsed
+        if clocks[player] < 0:
+            result, termination = BLACK_WINS if player == Player.WHITE else WHITE_WINS, 'time forfeit'
+            break
+        clocks[player] += settings.time_control.increment
+
+        moves.append({
+            'uci': search.move.to_uci(),
+            'san': to_san(board, search.move),
+            'time': search.elapsed,
+            'overrun': search.overrun,
+            'nodes': search.nodes,
+            'depth': search.depth,
+            'score': search.score
+        })
+        board.move_piece(search.move.from_square, search.move.to_square)
+
+    return {
+        'game_id': settings.game_id,
+        'time_control': str(settings.time_control),
+        'opening': list(settings.opening),
+        'result': result,
+        'termination': termination,
+        'moves': moves
+    }
+
+
+def to_pgn(record):
+    """
+    Writes a game record out in PGN.
+    """
+    headers = [
+        ('Event', 'Chessington self-play'),
+        ('Round', str(record['game_id'] + 1)),
+        ('White', 'Chessington'),
+        ('Black', 'Chessington'),
+        ('Result', record['result']),
+        ('TimeControl', record['time_control']),
+        ('Termination', record['termination'])
+    ]
+    lines = ['[{} "{}"]'.format(name, value) for name, value in headers]
+
+    tokens = []
+    for ply, move in enumerate(record['moves']):
+        if ply % 2 == 0:
+            tokens.append('{}.'.format(ply // 2 + 1))
+        tokens.append(move['san'])
+        if not move.get('book'):
+            tokens.append('{{{:.3f}s {} nodes}}'.format(move['time'], move['nodes']))
+    tokens.append(record['result'])
+
+    return '\n'.join(lines) + '\n\n' + ' '.join(tokens) + '\n\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Plays the bot against itself, without the GUI.')
+    parser.add_argument('--games', type=int, default=10, help='the number of games to play')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count(),
+                        help='the number of games to play at once (default: one per CPU)')
+    parser.add_argument('--time-control', type=TimeControl.parse, default=TimeControl(base=60.0, increment=0.5),
+                        help="the time control, in seconds, as 'base+increment' (default: 60+0.5)")
+    parser.add_argument('--openings', help='a file of openings, one per line, as moves such as "e2e4 e7e5"')
+    parser.add_argument('--depth', type=int, default=None, help='the maximum search depth for each move')
+    parser.add_argument('--max-plies', type=int, default=DEFAULT_MAX_PLIES,
+                        help='the number of plies after which the game is scored as a draw')
+    parser.add_argument('--output', default='selfplay',
+                        help='the prefix of the output files, which are written to <output>.pgn and <output>.jsonl')
+    args = parser.parse_args(argv)
+
+    try:
+        openings = read_openings(args.openings) if args.openings else [[]]
+    except ValueError as error:
+        parser.error(str(error))
+    max_depth = args.depth if args.depth is not None else Bot().max_depth
+    games = [GameSettings(game_id=game_id, opening=openings[game_id % len(openings)],
+                          time_control=args.time_control, max_depth=max_depth, max_plies=args.max_plies)
+             for game_id in range(args.games)]
+
+    scores = {WHITE_WINS: 0, BLACK_WINS: 0, DRAW: 0}
+    with multiprocessing.Pool(processes=args.workers) as pool, \
+            open(args.output + '.pgn', 'w') as pgn_file, \
+            open(args.output + '.jsonl', 'w') as json_file:
+        for record in pool.imap_unordered(play_game, games):
+            pgn_file.write(to_pgn(record))
+            pgn_file.flush()
+            json_file.write(json.dumps(record) + '\n')
+            json_file.flush()
+            scores[record['result']] += 1
+            print('Game {} finished {} after {} plies'.format(record['game_id'] + 1, record['result'],
+                                                              len(record['moves'])))
+
+    print('White wins: {}, black wins: {}, draws: {}'.format(scores[WHITE_WINS], scores[BLACK_WINS], scores[DRAW]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+A front end which speaks the Universal Chess Interface (UCI) protocol over stdin and stdout, so that the bot can be
+played by chess GUIs and tournament managers, or run headless.
+
+Searches run on their own thread while the main thread carries on reading commands, so that `stop` interrupts a
+search within a few milliseconds. Run with ``poetry run chessington-uci``.
+"""
+
+import sys
+import threading
+
+from chessington.engine.board import Board, BOARD_SIZE, STARTING_FEN
+from chessington.engine.bot import Bot, TimeManager, MATE_SCORE, DEFAULT_MAX_DEPTH
+from chessington.engine.moves import decode_move
+from chessington.engine.data import Player, Move
+from chessington.engine.pieces import Pawn
+
+ENGINE_NAME = 'Chessington'
+ENGINE_AUTHOR = 'the Chessington developers'
+MAX_LINES = 16
+NULL_MOVE = '0000'
+
+GO_INTEGER_PARAMETERS = ('depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo')
+
+
+def format_move(board, move):
+    """
+    Writes a move in UCI's long algebraic notation, adding the promotion piece for a pawn reaching the last rank,
+    which is always a queen.
+    """
+    text = move.to_uci()
+    if isinstance(board.get_piece(move.from_square), Pawn) and move.to_square.row in (0, BOARD_SIZE - 1):
+        text += 'q'
+    return text
+
+
+def format_line(board, moves):
+    """
+    Writes a line of moves played one after another from the given position.
+    """
+    texts = []
+    for move in moves:
+        texts.append(format_move(board, move))
+        board = board.clone()
+        board.move_piece(move.from_square, move.to_square)
+    return ' '.join(texts)
+
+
+def format_score(score):
+    """
+    Writes a score as UCI does: in centipawns, or as the number of moves to mate, which is negative if the engine is
+    the one being mated.
+    """
+    if abs(score) >= MATE_SCORE - DEFAULT_MAX_DEPTH:
+        moves = (MATE_SCORE - abs(score) + 1) // 2
+        return 'mate {}'.format(moves if score > 0 else -moves)
+    return 'cp {}'.format(score)
+
+
+def parse_go(tokens):
+    """
+    Reads the parameters of a `go` command into a dictionary, with True for the flags `infinite` and `ponder`.
+    """
+    parameters = {}
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        if token in ('infinite', 'ponder'):
+            parameters[token] = True
+        elif token in GO_INTEGER_PARAMETERS and index + 1 < len(tokens):
+            parameters[token] = int(tokens[index + 1])
+            index += 1
+        index += 1
+    return parameters
+
+
+def get_budget(parameters, player):
+    """
+    The time in seconds the search may take, given the parameters of a `go` command, or None if it may run until
+    it is stopped.
+    """
+    if 'movetime' in parameters:
+        return parameters['movetime'] / 1000
+    remaining, increment = ('wtime', 'winc') if player == Player.WHITE else ('btime', 'binc')
+    if remaining in parameters:
+        return TimeManager.from_clock(parameters[remaining] / 1000, parameters.get(increment, 0) / 1000,
+                                      parameters.get('movestogo')).budget
+    return None
+
+
+class UciEngine:
+    """
+    Carries out UCI commands one line at a time, writing its replies to the output.
+    """
+
+    def __init__(self, output=None):
+        self.output = output if output is not None else sys.stdout
+        self.bot = Bot()
+        self.board = Board.at_starting_position()
+        self.lines = 1
+        self._output_lock = threading.Lock()
+        self._search_thread = None
+        self._time_manager = None
+        self._release = threading.Event()
+        self._pondering = False
+        self._ponder_budget = None
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def run(self, input_stream):
+        """
+        Reads and carries out commands until `quit` or the end of the input.
+        """
+        for line in input_stream:
+            if not self.handle(line):
+                break
+        self.stop()
+
+    def handle(self, line):
+        """
+        Carries out a single command, returning False if it was `quit`. Unknown commands are ignored, as UCI asks,
+        and a command which cannot be read is reported with `info string` and otherwise ignored.
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+
+        if command == 'quit':
+            return False
+        try:
+            self._dispatch(command, arguments)
+        except (ValueError, IndexError) as error:
+            self.send('info string Ignored invalid command \'{}\': {}'.format(line.strip(), error))
+        return True
+
+    def _dispatch(self, command, arguments):
+        if command == 'uci':
+            self.send('id name {}'.format(ENGINE_NAME))
+            self.send('id author {}'.format(ENGINE_AUTHOR))
+            self.send('option name MultiPV type spin default 1 min 1 max {}'.format(MAX_LINES))
+            self.send('option name Ponder type check default false')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'ucinewgame':
+            self.stop()
+            self.bot.table.clear()
+            self.board = Board.at_starting_position()
+        elif command == 'setoption':
+            self.set_option(arguments)
+        elif command == 'position':
+            self.stop()
+            self.set_position(arguments)
+        elif command == 'go':
+            self.stop()
+            self.go(parse_go(arguments))
+        elif command == 'stop':
+            self.stop()
+        elif command == 'ponderhit':
+            self.ponder_hit()
+
+    def set_option(self, arguments):
+        text = ' '.join(arguments)
+        name, _, value = text.partition(' value ')
+        name = name.replace('name', '', 1).strip()
+        if name.lower() == 'multipv':
+            self.lines = max(1, min(MAX_LINES, int(value)))
+
+    def set_position(self, arguments):
+        if 'moves' in arguments:
+            moves = arguments[arguments.index('moves') + 1:]
+            arguments = arguments[:arguments.index('moves')]
+        else:
+            moves = []
+
+        if arguments[:1] == ['fen']:
+            board = Board.from_fen(' '.join(arguments[1:]))
+        else:
+            board = Board.from_fen(STARTING_FEN)
+
+        # The board is only replaced once the whole position has been read, so that a bad one leaves the last in place
+        for text in moves:
+            move = Move.from_uci(text)
+            if move not in Bot.generate_legal_moves(board):
+                raise ValueError('{} is not a legal move in this position'.format(text))
+            board.move_piece(move.from_square, move.to_square)
+        self.board = board
+
+    def go(self, parameters):
+        """
+        Starts searching the current position on the search thread. An infinite or ponder search does not report
+        its best move until it is stopped, or until the opponent plays the expected move.
+        """
+        budget = get_budget(parameters, self.board.current_player)
+        self._pondering = parameters.get('ponder', False)
+        self._ponder_budget = budget
+        if self._pondering:
+            budget = None
+
+        # Started here rather than on the search thread, so that a `ponderhit` straight away can change the budget
+        self._time_manager = TimeManager(budget=budget)
+        self._time_manager.start()
+        if parameters.get('infinite') or self._pondering:
+            self._release.clear()
+        else:
+            self._release.set()
+        self._search_thread = threading.Thread(target=self._search, daemon=True, args=(
+            self.board, self._time_manager, parameters.get('depth', self.bot.max_depth)))
+        self._search_thread.start()
+
+    def ponder_hit(self):
+        """
+        The opponent played the move being pondered on, so the search carries on as the real search, now with the
+        time allowed by the `go ponder` command.
+        """
+        if self._pondering:
+            self._pondering = False
+            self._time_manager.set_budget(self._ponder_budget)
+            self._release.set()
+
+    def stop(self):
+        """
+        Stops the search, if there is one, and waits for it to report its best move.
+        """
+        if self._search_thread is None:
+            return
+        self._pondering = False
+        self._time_manager.cancel()
+        self._release.set()
+        self._search_thread.join()
+        self._search_thread = None
+
+    def wait(self):
+        """
+        Waits for a search which is not infinite to finish by itself.
+        """
+        if self._search_thread is not None:
+            self._search_thread.join()
+            self._search_thread = None
+
+    def _search(self, board, time_manager, max_depth):
+        best_line = None
+        for analysis in self.bot.analyse(board, self.lines, time_manager, max_depth):
+            time_ms = int(analysis.elapsed * 1000)
+            for rank, line in enumerate(analysis.lines, 1):
+                self.send('info depth {} multipv {} score {} nodes {} nps {} time {} pv {}'.format(
+                    analysis.depth, rank, format_score(line.score), analysis.nodes, analysis.nps, time_ms,
+                    format_line(board, line.pv)))
+            best_line = analysis.lines[0].pv
+
+        # Stopped before the first depth was complete, so fall back to the legal move the search would have tried
+        # first, or to the null move if there is none
+        if best_line is None:
+            best_line = [decode_move(move) for move in self.bot.root_moves[:1]]
+
+        self._release.wait()
+        texts = format_line(board, best_line[:2]).split() or [NULL_MOVE]
+        if len(texts) > 1:
+            self.send('bestmove {} ponder {}'.format(*texts))
+        else:
+            self.send('bestmove {}'.format(texts[0]))
+
+
+def main():
+    UciEngine().run(sys.stdin)
+
+
+if __name__ == '__main__':
+    main()
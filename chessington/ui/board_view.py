@@ -0,0 +1,104 @@
+"""
+What each square of the GUI's board shows: the image of the piece on it and its colour. This does not import
+PySimpleGUI, so that it can be used without it.
+"""
+
+import base64
+import os
+
+from chessington.engine.board import BOARD_SIZE
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+IMAGES_BASE_DIRECTORY = 'images'
+
+BLACK_SQUARE_COLOUR = '#858585'
+WHITE_SQUARE_COLOUR = '#e1e1f7'
+FROM_SQUARE_COLOUR = '#916e6e'
+TO_SQUARE_COLOUR = '#58579c'
+
+PIECE_NAMES = {Pawn: 'pawn', Knight: 'knight', Bishop: 'bishop', Rook: 'rook', Queen: 'queen', King: 'king'}
+PLAYER_SUFFIXES = {Player.WHITE: 'w', Player.BLACK: 'b'}
+IMAGE_NAMES = {(piece_class, player): piece_name + suffix + '.png'
+               for piece_class, piece_name in PIECE_NAMES.items()
+               for player, suffix in PLAYER_SUFFIXES.items()}
+BLANK_IMAGE_NAME = 'blank.png'
+
+_piece_images = None
+
+
+def load_piece_images(directory=IMAGES_BASE_DIRECTORY):
+    """
+    Reads every piece image from disk into memory, base64-encoded as PySimpleGUI expects image data to be, keyed by
+    (piece class, player), with the blank square image stored under None.
+    """
+    def read_image(name):
+        with open(os.path.join(directory, name), 'rb') as image_file:
+            return base64.b64encode(image_file.read())
+
+    images = {key: read_image(name) for key, name in IMAGE_NAMES.items()}
+    images[None] = read_image(BLANK_IMAGE_NAME)
+    return images
+
+
+def get_image_data_from_piece(piece):
+    global _piece_images
+    if _piece_images is None:
+        _piece_images = load_piece_images()
+    if piece is None:
+        return _piece_images[None]
+    return _piece_images[(piece.__class__, piece.player)]
+
+
+def get_key_from_square(square):
+    return (square.row, square.col)
+
+
+def get_square_colour(square):
+    return BLACK_SQUARE_COLOUR if square.row % 2 == square.col % 2 else WHITE_SQUARE_COLOUR
+
+
+class BoardView:
+    """
+    Remembers what each button on the board is currently showing, so that redrawing the board only updates
+    the buttons whose image or colour has actually changed.
+    """
+
+    def __init__(self, window, board):
+        self.window = window
+        self.elements = {}
+        self.images = {}
+        self.colours = {}
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                square = Square.at(row, col)
+                key = get_key_from_square(square)
+                self.images[key] = get_image_data_from_piece(board.get_piece(square))
+                self.colours[key] = get_square_colour(square)
+
+    def get_element(self, key):
+        element = self.elements.get(key)
+        if element is None:
+            element = self.window.FindElement(key=key)
+            self.elements[key] = element
+        return element
+
+    def redraw(self, board, from_square, to_squares):
+        colours = {}
+        if from_square is not None:
+            colours[get_key_from_square(from_square)] = FROM_SQUARE_COLOUR
+        for square in to_squares:
+            colours[get_key_from_square(square)] = TO_SQUARE_COLOUR
+
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                square = Square.at(row, col)
+                key = get_key_from_square(square)
+                image_data = get_image_data_from_piece(board.get_piece(square))
+                colour = colours.get(key) or get_square_colour(square)
+                if image_data is not self.images[key]:
+                    self.get_element(key).Update(image_data=image_data)
+                    self.images[key] = image_data
+                if colour != self.colours[key]:
+                    self.get_element(key).Update(button_color=('white', colour))
+                    self.colours[key] = colour
@@ -0,0 +1,195 @@
+"""
+A GUI chess board that can be interacted with, and pieces moved around on.
+"""
+
+import queue
+import threading
+
+import PySimpleGUI as psg
+import random
+from chessington.engine.board import Board, BOARD_SIZE
+from chessington.engine.bot import Bot, Ponderer, TimeManager
+from chessington.engine.data import Player, Square, GameState
+from chessington.engine.move_cache import MoveCache
+from chessington.ui.board_view import BoardView, get_image_data_from_piece, get_key_from_square, get_square_colour
+
+STATUS_KEY = 'status'
+STOP_KEY = 'stop'
+
+BOT_MOVE_BUDGET = 5.0
+BOT_POLL_INTERVAL_MS = 100
+
+
+def random_hex():
+    allowed_chars = "ABCDEF0123456789"
+    string = '#'
+    for i in range(0, 6):
+        string += random.choice(allowed_chars)
+    return string
+
+
+def render_square(board, square):
+    piece = board.get_piece(square)
+    image_data = get_image_data_from_piece(piece)
+    square_colour = get_square_colour(square)
+    key = get_key_from_square(square)
+    return psg.Button('', image_data=image_data, size=(1, 1), button_color=('white', square_colour), pad=(0, 0), key=key)
+
+
+def render_board(board):
+    return [[render_square(board, Square.at(row, col)) for col in range(BOARD_SIZE)] for row in range(BOARD_SIZE - 1, -1, -1)]
+
+
+class BotWorker:
+    """
+    Runs the bot's search on a background thread, so that the GUI stays responsive while the bot is thinking.
+    The chosen move is posted to a queue, which the GUI's event loop polls. While the player is thinking, the bot
+    ponders on the reply it expects.
+    """
+
+    def __init__(self, bot, budget=BOT_MOVE_BUDGET):
+        self.bot = bot
+        self.ponderer = Ponderer(bot)
+        self.budget = budget
+        self.results = queue.Queue()
+        self.time_manager = None
+        self.thread = None
+
+    def is_thinking(self):
+        """
+        Whether a search has been started whose result has not yet been collected by `poll`.
+        """
+        return self.thread is not None
+
+    def start(self, board):
+        self.time_manager = TimeManager(budget=self.budget)
+        self.thread = threading.Thread(target=self._search, args=(board, self.time_manager), daemon=True)
+        self.thread.start()
+
+    def _search(self, board, time_manager):
+        self.results.put(self.ponderer.search(board, time_manager))
+
+    def ponder(self, board):
+        """
+        Starts thinking on the player's time, about the position after the move the bot expects them to play.
+        """
+        self.ponderer.start(board)
+
+    def cancel(self):
+        """
+        Tells the bot to stop thinking, and play the best move it has found so far.
+        """
+        if self.time_manager is not None:
+            self.time_manager.cancel()
+
+    def poll(self):
+        """
+        Returns the result of a finished search, or None if the bot is still thinking.
+        """
+        try:
+            result = self.results.get_nowait()
+        except queue.Empty:
+            return None
+        self.thread = None
+        return result
+
+    def status(self):
+        if not self.is_thinking():
+            expected_move = self.ponderer.expected_move
+            return 'Pondering on {}...'.format(expected_move.to_uci()) if expected_move is not None else ''
+        return 'Thinking... depth {}, {} nodes'.format(self.bot.depth + 1, self.bot.nodes)
+
+
+def describe_game_state(board, state):
+    """
+    A line for the status bar saying whether a player is in check or how the game ended, or '' if neither.
+    """
+    player = board.current_player.name.capitalize()
+    if state == GameState.CHECK:
+        return '{} is in check'.format(player)
+    if state == GameState.CHECKMATE:
+        return 'Checkmate - {} wins'.format(board.current_player.opponent().name.capitalize())
+    if state == GameState.STALEMATE:
+        return 'Stalemate - the game is drawn'
+    if state == GameState.REPETITION:
+        return 'Repetition - the game is drawn'
+    if state == GameState.KING_CAPTURED:
+        return 'King captured - game over'
+    return ''
+
+
+def play_game(bot_player=None):
+    psg.ChangeLookAndFeel('GreenTan')
+
+    board = Board.at_starting_position()
+    board_layout = render_board(board)
+    board_layout.append([psg.Text('', size=(50, 1), key=STATUS_KEY), psg.Button('Stop', key=STOP_KEY)])
+    window = psg.Window('Chessington', default_button_element_size=(12, 1), auto_size_buttons=False).Layout(board_layout)
+
+    worker = BotWorker(Bot()) if bot_player is not None else None
+    move_cache = MoveCache()
+    from_square = None
+    to_squares = []
+    state = board.game_state()
+
+    def handle_click(row, col):
+
+        nonlocal window, board, from_square, to_squares, state
+        clicked_piece = board.get_piece(Square.at(row, col))
+
+        # If making an allowed move, then make it
+        if from_square is not None and any(s.row == row and s.col == col for s in to_squares):
+            board.get_piece(from_square).move_to(board, Square.at(row, col))
+            from_square, to_squares = None, []
+            state = board.game_state()
+
+        # If clicking on a piece whose turn it is, get its allowed moves
+        elif clicked_piece is not None and clicked_piece.player == board.current_player:
+            from_square = Square.at(row, col)
+            to_squares = move_cache.get_available_moves(board, from_square)
+
+        # Otherwise reset everthing to default
+        else:
+            from_square, to_squares = None, []
+
+    view = BoardView(window, board)
+
+    while True:
+
+        # Start the bot thinking if it is its turn, and the game is not over
+        if worker is not None and board.current_player == bot_player and not worker.is_thinking() and \
+                not state.is_over():
+            worker.start(board)
+
+        # Check for a square being clicked on, or the bot finishing, and react appropriately
+        timeout = BOT_POLL_INTERVAL_MS if worker is not None and worker.is_thinking() else None
+        event, _ = window.Read(timeout=timeout)
+        if event is None:
+            if worker is not None:
+                worker.cancel()
+                worker.ponderer.stop()
+            break
+
+        if event == STOP_KEY:
+            if worker is not None:
+                worker.cancel()
+        elif isinstance(event, tuple) and board.current_player != bot_player and not state.is_over():
+            handle_click(*event)
+
+        result = worker.poll() if worker is not None else None
+        if result is not None and result.move is not None:
+            board.move_piece(result.move.from_square, result.move.to_square)
+            state = board.game_state()
+            if not state.is_over():
+                worker.ponder(board)
+
+        # Update the UI
+        status = describe_game_state(board, state)
+        if worker is not None and not state.is_over():
+            status = '. '.join(text for text in (status, worker.status()) if text)
+        window.FindElement(key=STATUS_KEY).Update(status)
+        view.redraw(board, from_square, to_squares)
+
+
+def play_against_bot():
+    play_game(bot_player=Player.BLACK)
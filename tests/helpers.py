@@ -0,0 +1,25 @@
+import random
+
+from chessington.engine.board import Board
+from chessington.engine.moves import generate_moves, new_move_buffer, decode_move
+
+
+def play_random_games(games, plies, seed=1):
+    """
+    Plays random moves from the starting position, returning every position reached, in order, up to `plies`
+    positions from each game. Each position is a separate board.
+    """
+    generator = random.Random(seed)
+    buffer = new_move_buffer()
+    boards = []
+    for _ in range(games):
+        board = Board.at_starting_position()
+        for _ in range(plies):
+            boards.append(board)
+            moves = generate_moves(board, buffer)
+            if moves == 0:
+                break
+            move = decode_move(buffer[generator.randrange(moves)])
+            board = board.clone()
+            board.move_piece(move.from_square, move.to_square)
+    return boards
@@ -0,0 +1,50 @@
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+
+np = pytest.importorskip('numpy')
+
+from chessington.engine.batch import board_to_tensor, boards_to_tensor, evaluate_boards  # noqa: E402
+from tests.helpers import play_random_games  # noqa: E402
+
+
+class TestBatch:
+
+    @staticmethod
+    def test_boards_are_converted_to_piece_planes():
+
+        # Act
+        tensor = board_to_tensor(Board.at_starting_position())
+
+        # Assert
+        assert tensor.shape == (12, 64)
+        assert tensor.sum() == 32
+        assert tensor[0, 1 * 8 + 4] == 1
+        assert tensor[11, 7 * 8 + 4] == 1
+
+    @staticmethod
+    def test_batches_of_boards_are_stacked():
+
+        # Arrange
+        boards = [Board.at_starting_position(), Board.empty()]
+
+        # Act
+        tensor = boards_to_tensor(boards)
+
+        # Assert
+        assert tensor.shape == (2, 12, 64)
+        assert tensor[1].sum() == 0
+
+    @staticmethod
+    def test_batched_evaluation_matches_evaluating_each_board():
+
+        # Arrange
+        boards = play_random_games(games=1, plies=100)
+        boards[5].set_piece(Square.at(3, 3), None)
+
+        # Act
+        scores = evaluate_boards(boards)
+
+        # Assert
+        assert list(scores) == [board.evaluate() for board in boards]
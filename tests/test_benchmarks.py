@@ -0,0 +1,60 @@
+from benchmarks.micro import move_there_and_back
+from benchmarks.positions import get_position
+from benchmarks.runner import Measurement, compare, measure
+from benchmarks.ui import count_updates, get_frames
+
+
+class TestBenchmarks:
+
+    @staticmethod
+    def test_measurements_report_operations_per_second():
+
+        # Act
+        measurement = measure('noop', lambda _: None, repeats=3, min_time=0.001)
+
+        # Assert
+        assert measurement.ops_per_sec > 0
+        assert len(measurement.runs) == 3
+
+    @staticmethod
+    def test_slowdowns_beyond_the_threshold_are_regressions():
+
+        # Arrange
+        baseline = {'benchmarks': {'fast': {'ops_per_sec': 100.0}, 'slow': {'ops_per_sec': 100.0}}}
+        measurements = [Measurement('fast', 95.0, 1.0, [95.0]), Measurement('slow', 80.0, 1.0, [80.0]),
+                        Measurement('new', 1.0, 0.0, [1.0])]
+
+        # Act
+        regressions = compare(measurements, baseline, threshold=0.1)
+
+        # Assert
+        assert [name for name, _ in regressions] == ['slow']
+
+    @staticmethod
+    def test_moving_there_and_back_leaves_the_board_as_it_was():
+
+        # Arrange
+        board = get_position('open game')
+        fen, hash_history = board.to_fen(), board.hash_history
+
+        # Act
+        for _ in range(3):
+            move_there_and_back(board)
+
+        # Assert
+        assert board.to_fen() == fen
+        assert board.hash_history is hash_history
+
+    @staticmethod
+    def test_redrawing_only_changes_makes_far_fewer_updates_than_a_full_redraw():
+
+        # Arrange
+        frames = get_frames()
+
+        # Act
+        changes, everything = count_updates(frames)
+
+        # Assert
+        assert 0 < changes
+        assert everything == len(frames) * (2 * 64 + 2) - 2
+        assert 10 * changes < everything
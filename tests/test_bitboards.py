@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.pieces import Pawn, Rook, Knight, Queen
+
+np = pytest.importorskip('numpy')
+
+from chessington.engine.bitboards import (  # noqa: E402
+    boards_to_bitboards, count_moves, count_moves_by_piece_type, attack_masks, popcount, _swar_popcount,
+    KNIGHT, QUEEN
+)
+from chessington.engine.moves import generate_moves, new_move_buffer, EN_PASSANT  # noqa: E402
+from tests.helpers import play_random_games  # noqa: E402
+
+
+def count_generated_moves(board):
+    buffer = new_move_buffer()
+    count = generate_moves(board, buffer)
+    return sum(1 for index in range(count) if not buffer[index] >> 12 & EN_PASSANT)
+
+
+def to_bitboard(*squares):
+    return sum(1 << (square.row * 8 + square.col) for square in squares)
+
+
+class TestBitboards:
+
+    @staticmethod
+    def test_starting_position_has_twenty_moves():
+
+        # Arrange
+        bitboards, white_to_move = boards_to_bitboards([Board.at_starting_position()])
+
+        # Act
+        counts = count_moves_by_piece_type(bitboards, white_to_move)
+
+        # Assert
+        assert counts[0].tolist() == [16, 4, 0, 0, 0, 0]
+
+    @staticmethod
+    def test_move_counts_match_generated_moves():
+
+        # Arrange
+        boards = play_random_games(games=8, plies=80)
+        bitboards, white_to_move = boards_to_bitboards(boards)
+
+        # Act
+        counts = count_moves(bitboards, white_to_move)
+
+        # Assert
+        assert counts.tolist() == [count_generated_moves(board) for board in boards]
+
+    @staticmethod
+    def test_blocked_sliders_and_leapers_are_counted():
+
+        # Arrange
+        board = Board.empty()
+        board.current_player = Player.BLACK
+        board.set_piece(Square.at(4, 4), Queen(Player.BLACK))
+        board.set_piece(Square.at(6, 4), Pawn(Player.BLACK))
+        board.set_piece(Square.at(4, 1), Pawn(Player.WHITE))
+        board.set_piece(Square.at(0, 0), Knight(Player.BLACK))
+        bitboards, white_to_move = boards_to_bitboards([board])
+
+        # Act
+        counts = count_moves_by_piece_type(bitboards, white_to_move)
+
+        # Assert
+        assert counts[0, QUEEN] == 23
+        assert counts[0, KNIGHT] == 2
+
+    @staticmethod
+    def test_rook_on_empty_board_attacks_its_rank_and_file():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(0, 0), Rook(Player.WHITE))
+        bitboards, _ = boards_to_bitboards([board])
+
+        # Act
+        masks = attack_masks(bitboards)
+
+        # Assert
+        assert popcount(masks[:, 0]).tolist() == [14]
+        assert masks[0, 1] == 0
+
+    @staticmethod
+    def test_pawns_attack_diagonally_forwards():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(1, 4), Pawn(Player.WHITE))
+        board.set_piece(Square.at(6, 0), Pawn(Player.BLACK))
+        bitboards, _ = boards_to_bitboards([board])
+
+        # Act
+        masks = attack_masks(bitboards)
+
+        # Assert
+        assert int(masks[0, 0]) == to_bitboard(Square.at(2, 3), Square.at(2, 5))
+        assert int(masks[0, 1]) == to_bitboard(Square.at(5, 1))
+
+    @staticmethod
+    def test_swar_popcount_matches_counting_bits():
+
+        # Arrange
+        generator = random.Random(1)
+        values = [generator.getrandbits(64) for _ in range(100)] + [0, 2 ** 64 - 1]
+
+        # Act
+        counts = _swar_popcount(np.array(values, dtype=np.uint64))
+
+        # Assert
+        assert counts.tolist() == [bin(value).count('1') for value in values]
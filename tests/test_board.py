@@ -1,5 +1,11 @@
-from chessington.engine.board import Board
-from chessington.engine.data import Player, Square
+import random
+
+import pytest
+
+from chessington.engine.board import Board, STARTING_FEN
+from chessington.engine.data import Player, Square, GameState
+from chessington.engine.moves import generate_moves, new_move_buffer, decode_move, CAPTURE, EN_PASSANT
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
 
 def test_new_board_has_white_pieces_at_bottom():
 
@@ -35,4 +41,356 @@ def test_pieces_can_be_moved_on_the_board():
     board.move_piece(from_square, to_square)
 
     assert board.get_piece(from_square) is None
-    assert board.get_piece(to_square) is piece
\ No newline at end of file
+    assert board.get_piece(to_square) is piece
+
+def test_cloned_boards_share_rows_until_they_are_changed():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    clone = board.clone()
+    clone.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Assert
+    assert clone.board[0] is board.board[0]
+    assert clone.board[1] is not board.board[1]
+    assert clone.board[3] is not board.board[3]
+
+
+def test_changing_a_clone_does_not_change_the_original_board():
+
+    # Arrange
+    board = Board.at_starting_position()
+    pawn = board.get_piece(Square.at(1, 4))
+
+    # Act
+    clone = board.clone()
+    clone.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Assert
+    assert board.get_piece(Square.at(1, 4)) is pawn
+    assert board.get_piece(Square.at(3, 4)) is None
+    assert board.current_player == Player.WHITE
+    assert clone.current_player == Player.BLACK
+
+
+def test_changing_the_original_board_does_not_change_its_clone():
+
+    # Arrange
+    board = Board.at_starting_position()
+    clone = board.clone()
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Assert
+    assert clone.get_piece(Square.at(3, 4)) is None
+    assert clone.get_piece(Square.at(1, 4)) is not None
+
+
+def test_halfmove_clock_is_reset_by_pawn_moves():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.move_piece(Square.at(0, 6), Square.at(2, 5))
+    board.move_piece(Square.at(7, 6), Square.at(5, 5))
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Assert
+    assert board.halfmove_clock == 0
+    assert board.fullmove_number == 2
+
+
+def test_boards_reached_by_different_move_orders_have_the_same_hash():
+
+    # Arrange
+    board = Board.at_starting_position()
+    other_board = Board.at_starting_position()
+
+    # Act
+    board.move_piece(Square.at(0, 6), Square.at(2, 5))
+    board.move_piece(Square.at(7, 6), Square.at(5, 5))
+    board.move_piece(Square.at(0, 1), Square.at(2, 2))
+    other_board.move_piece(Square.at(0, 1), Square.at(2, 2))
+    other_board.move_piece(Square.at(7, 6), Square.at(5, 5))
+    other_board.move_piece(Square.at(0, 6), Square.at(2, 5))
+
+    # Assert
+    assert board.get_position_hash() == other_board.get_position_hash()
+    assert board.get_position_hash() != Board.at_starting_position().get_position_hash()
+
+
+def test_positions_repeated_three_times_are_detected():
+
+    # Arrange
+    board = Board.at_starting_position()
+    knight_moves = [(Square.at(0, 6), Square.at(2, 5)), (Square.at(7, 6), Square.at(5, 5)),
+                    (Square.at(2, 5), Square.at(0, 6)), (Square.at(5, 5), Square.at(7, 6))]
+
+    # Act
+    for from_square, to_square in knight_moves:
+        board.move_piece(from_square, to_square)
+    repeated_twice = board.is_repetition()
+    for from_square, to_square in knight_moves:
+        board.move_piece(from_square, to_square)
+
+    # Assert
+    assert not repeated_twice
+    assert board.is_repetition(2)
+    assert board.is_repetition()
+
+
+def test_pawn_moves_clear_the_repetition_history():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.move_piece(Square.at(0, 6), Square.at(2, 5))
+    board.move_piece(Square.at(7, 6), Square.at(5, 5))
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(2, 4))
+
+    # Assert
+    assert board.hash_history is None
+
+
+def test_starting_position_evaluates_as_level():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    score = board.evaluate()
+
+    # Assert
+    assert score == 0
+
+
+def test_evaluation_is_from_the_point_of_view_of_the_player_to_move():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.set_piece(Square.at(7, 3), None)
+
+    # Act
+    white_score = board.evaluate()
+    board.current_player = Player.BLACK
+    black_score = board.evaluate()
+
+    # Assert
+    assert white_score > 800
+    assert black_score == -white_score
+
+
+def test_evaluation_is_updated_by_captures_en_passant_and_promotion():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(4, 4), Pawn(Player.WHITE))
+    board.set_piece(Square.at(6, 3), Pawn(Player.BLACK))
+    board.set_piece(Square.at(6, 7), Pawn(Player.WHITE))
+    board.set_piece(Square.at(1, 0), Queen(Player.BLACK))
+
+    # Act
+    board.current_player = Player.BLACK
+    board.move_piece(Square.at(6, 3), Square.at(4, 3))
+    board.move_piece(Square.at(4, 4), Square.at(5, 3))
+    board.move_piece(Square.at(1, 0), Square.at(1, 1))
+    board.move_piece(Square.at(6, 7), Square.at(7, 7))
+
+    # Assert
+    recomputed = Board(board.current_player, [row[:] for row in board.board])
+    recomputed.current_player = board.current_player
+    assert isinstance(board.get_piece(Square.at(7, 7)), Queen)
+    assert board.get_piece(Square.at(4, 3)) is None
+    assert board.evaluate() == recomputed.evaluate()
+
+
+def test_board_from_starting_fen_matches_starting_position():
+
+    # Act
+    board = Board.from_fen(STARTING_FEN)
+
+    # Assert
+    assert board.get_position_hash() == Board.at_starting_position().get_position_hash()
+    assert board.current_player == Player.WHITE
+
+
+def test_fen_round_trips_player_en_passant_and_counters():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Act
+    fen = board.to_fen()
+    copy = Board.from_fen(fen)
+
+    # Assert
+    assert fen == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - e3 0 1'
+    assert copy.en_passant_state == Square.at(3, 4)
+    assert copy.get_position_hash() == board.get_position_hash()
+    assert copy.to_fen() == fen
+
+
+def test_invalid_fen_is_rejected():
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        Board.from_fen('rnbqkbnr/pppppppp/8/8 w - - 0 1')
+
+
+def test_king_attacked_by_a_rook_is_in_check():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/8/4R1K1 b - - 0 1')
+
+    # Act / Assert
+    assert board.is_in_check(Player.BLACK)
+    assert not board.is_in_check(Player.WHITE)
+
+
+def test_blocked_slider_does_not_give_check():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/1b6/2N5/8/4K3 w - - 0 1')
+
+    # Act / Assert
+    assert not board.is_in_check(Player.WHITE)
+
+
+def test_pawns_attack_diagonally_forwards_only():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(3, 3), Pawn(Player.WHITE))
+
+    # Act / Assert
+    assert board.is_square_attacked(Square.at(4, 2), Player.WHITE)
+    assert board.is_square_attacked(Square.at(4, 4), Player.WHITE)
+    assert not board.is_square_attacked(Square.at(4, 3), Player.WHITE)
+    assert not board.is_square_attacked(Square.at(2, 2), Player.WHITE)
+    assert not board.is_square_attacked(Square.at(4, 2), Player.BLACK)
+
+
+def test_king_is_tracked_as_it_moves_and_is_captured():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(0, 4), King(Player.WHITE))
+    board.set_piece(Square.at(7, 4), Rook(Player.BLACK))
+    board.move_piece(Square.at(0, 4), Square.at(0, 3))
+    clone = board.clone()
+
+    # Act
+    board.move_piece(Square.at(7, 4), Square.at(7, 3))
+    clone.move_piece(Square.at(7, 4), Square.at(0, 4))
+    clone.current_player = Player.BLACK
+    clone.move_piece(Square.at(0, 4), Square.at(0, 3))
+
+    # Assert
+    assert board.find_king(Player.WHITE) == Square.at(0, 3)
+    assert board.is_in_check(Player.WHITE)
+    assert clone.find_king(Player.WHITE) is None
+    assert not clone.is_in_check(Player.WHITE)
+
+
+def test_attacked_squares_match_captures_in_random_positions():
+
+    # Arrange
+    generator = random.Random(1)
+    buffer = new_move_buffer()
+    pieces = [Pawn, Knight, Bishop, Rook, Queen, King]
+
+    for _ in range(50):
+        board = Board.empty()
+        for _ in range(12):
+            piece = generator.choice(pieces)(generator.choice([Player.WHITE, Player.BLACK]))
+            row = generator.randrange(1, 7) if isinstance(piece, Pawn) else generator.randrange(8)
+            board.set_piece(Square.at(row, generator.randrange(8)), piece)
+
+        for attacker in (Player.WHITE, Player.BLACK):
+            board.current_player = attacker
+            count = generate_moves(board, buffer)
+            captured = {decode_move(buffer[index]).to_square for index in range(count)
+                        if buffer[index] >> 12 & CAPTURE and not buffer[index] >> 12 & EN_PASSANT}
+
+            # Act
+            attacked = {Square.at(row, col) for row in range(8) for col in range(8)
+                        if board.get_piece(Square.at(row, col)) is not None
+                        and board.get_piece(Square.at(row, col)).player != attacker
+                        and board.is_square_attacked(Square.at(row, col), attacker)}
+
+            # Assert
+            assert attacked == captured
+
+
+def test_back_rank_mate_is_checkmate():
+
+    # Arrange
+    board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+    board.move_piece(Square.at(0, 0), Square.at(7, 0))
+
+    # Act
+    state = board.game_state()
+
+    # Assert
+    assert state == GameState.CHECKMATE
+    assert state.is_over()
+    assert not board.has_legal_move(Player.BLACK)
+
+
+def test_check_which_can_be_blocked_is_not_checkmate():
+
+    # Arrange
+    board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R2r2K1 w - - 0 1')
+    board.move_piece(Square.at(0, 0), Square.at(7, 0))
+
+    # Act
+    state = board.game_state()
+
+    # Assert
+    assert state == GameState.CHECK
+    assert not state.is_over()
+
+
+def test_king_with_no_safe_square_and_no_other_moves_is_stalemate():
+
+    # Arrange
+    board = Board.from_fen('7k/8/6Q1/8/8/8/8/K7 b - - 0 1')
+
+    # Act / Assert
+    assert board.game_state() == GameState.STALEMATE
+
+
+def test_pinned_piece_has_no_legal_move():
+
+    # Arrange
+    board = Board.from_fen('rr5k/8/8/8/8/8/N7/K7 w - - 0 1')
+
+    # Act / Assert
+    assert not board.has_legal_move(Player.WHITE)
+    assert board.has_legal_move(Player.BLACK)
+    assert board.game_state() == GameState.STALEMATE
+
+
+def test_missing_king_ends_the_game():
+
+    # Arrange
+    board = Board.from_fen('8/8/8/8/8/8/8/K7 w - - 0 1')
+
+    # Act / Assert
+    assert board.game_state() == GameState.KING_CAPTURED
+
+
+def test_other_player_cannot_capture_en_passant():
+
+    # Arrange
+    board = Board.from_fen('8/8/8/1k6/1P6/8/2q5/K7 b - c3 0 1')
+
+    # Act / Assert
+    assert not board.has_legal_move(Player.WHITE)
+    assert board.has_legal_move(Player.BLACK)
@@ -0,0 +1,76 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.ui.board_view import BoardView, FROM_SQUARE_COLOUR, TO_SQUARE_COLOUR, get_square_colour
+
+
+class StubElement:
+
+    def __init__(self, key, updates):
+        self.key = key
+        self.updates = updates
+
+    def Update(self, **changes):
+        self.updates.append((self.key, changes))
+
+
+class StubWindow:
+
+    def __init__(self):
+        self.updates = []
+
+    def FindElement(self, key):
+        return StubElement(key, self.updates)
+
+
+class TestBoardView:
+
+    @staticmethod
+    def test_redrawing_an_unchanged_board_updates_nothing():
+
+        # Arrange
+        board = Board.at_starting_position()
+        window = StubWindow()
+        view = BoardView(window, board)
+
+        # Act
+        view.redraw(board, None, [])
+
+        # Assert
+        assert window.updates == []
+
+    @staticmethod
+    def test_only_the_squares_a_piece_moved_between_are_updated():
+
+        # Arrange
+        board = Board.at_starting_position()
+        window = StubWindow()
+        view = BoardView(window, board)
+        board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+        # Act
+        view.redraw(board, None, [])
+
+        # Assert
+        assert sorted(key for key, _ in window.updates) == [(1, 4), (3, 4)]
+        assert all(list(changes) == ['image_data'] for _, changes in window.updates)
+
+    @staticmethod
+    def test_highlighted_squares_are_coloured_and_then_restored():
+
+        # Arrange
+        board = Board.at_starting_position()
+        window = StubWindow()
+        view = BoardView(window, board)
+        from_square, to_square = Square.at(1, 4), Square.at(2, 4)
+
+        # Act
+        view.redraw(board, from_square, [to_square])
+        highlighted = list(window.updates)
+        del window.updates[:]
+        view.redraw(board, None, [])
+
+        # Assert
+        assert highlighted == [((1, 4), {'button_color': ('white', FROM_SQUARE_COLOUR)}),
+                               ((2, 4), {'button_color': ('white', TO_SQUARE_COLOUR)})]
+        assert window.updates == [((1, 4), {'button_color': ('white', get_square_colour(from_square))}),
+                                  ((2, 4), {'button_color': ('white', get_square_colour(to_square))})]
@@ -0,0 +1,370 @@
+import asyncio
+import functools
+import threading
+
+from benchmarks.positions import get_position
+from chessington.engine.board import Board
+from chessington.engine.bot import Bot, Ponderer, SearchOptions, TimeManager, MATE_SCORE
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.pieces import Pawn, Rook, Queen, King
+
+# Positions from the benchmark corpus which are quick to search to the pruning tests' depth
+PRUNING_POSITIONS = ['start', 'queens gambit', 'endgame']
+PRUNING_DEPTH = 4
+NO_PRUNING = SearchOptions(principal_variation=False, null_move=False, late_move_reductions=False, futility=False)
+
+
+@functools.lru_cache(maxsize=None)
+def count_nodes(options):
+    return sum(Bot(options=options).search(get_position(name), max_depth=PRUNING_DEPTH).nodes
+               for name in PRUNING_POSITIONS)
+
+
+class TestBot:
+
+    @staticmethod
+    def test_bot_captures_undefended_queen():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(0, 4), King(Player.WHITE))
+        board.set_piece(Square.at(7, 4), King(Player.BLACK))
+        board.set_piece(Square.at(3, 0), Rook(Player.WHITE))
+        board.set_piece(Square.at(3, 7), Queen(Player.BLACK))
+        bot = Bot()
+
+        # Act
+        result = bot.search(board, max_depth=2)
+
+        # Assert
+        assert result.move == Move.between(Square.at(3, 0), Square.at(3, 7))
+        assert result.depth == 2
+
+    @staticmethod
+    def test_bot_does_not_change_the_board_it_searches():
+
+        # Arrange
+        board = Board.at_starting_position()
+        bot = Bot()
+
+        # Act
+        bot.search(board, max_depth=2)
+
+        # Assert
+        assert isinstance(board.get_piece(Square.at(1, 4)), Pawn)
+        assert board.get_piece(Square.at(3, 4)) is None
+        assert board.current_player == Player.WHITE
+
+    @staticmethod
+    def test_bot_returns_a_move_within_its_time_budget():
+
+        # Arrange
+        board = Board.at_starting_position()
+        bot = Bot()
+        time_manager = TimeManager(budget=0.2, check_interval=64)
+
+        # Act
+        result = bot.search(board, time_manager)
+
+        # Assert
+        assert result.move is not None
+        assert result.elapsed < 1.0
+        assert result.overrun < 0.5
+
+    @staticmethod
+    def test_cancelled_bot_returns_move_from_last_completed_depth():
+
+        # Arrange
+        board = Board.at_starting_position()
+        bot = Bot()
+        stop_event = threading.Event()
+        time_manager = TimeManager(stop_event=stop_event, check_interval=16)
+        threading.Timer(0.2, stop_event.set).start()
+
+        # Act
+        result = bot.search(board, time_manager)
+
+        # Assert
+        assert result.aborted
+        assert result.move is not None
+        assert result.depth >= 1
+
+    @staticmethod
+    def test_cancelling_async_search_stops_the_bot():
+
+        # Arrange
+        board = Board.at_starting_position()
+        bot = Bot()
+        time_manager = TimeManager(check_interval=16)
+
+        async def cancel_search():
+            task = asyncio.ensure_future(bot.search_async(board, time_manager))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        # Act
+        asyncio.run(cancel_search())
+
+        # Assert
+        assert time_manager.stop_event.is_set()
+
+    @staticmethod
+    def test_time_manager_never_allocates_more_than_the_remaining_clock():
+
+        # Act
+        time_manager = TimeManager.from_clock(remaining=1.0, increment=10.0)
+
+        # Assert
+        assert time_manager.budget < 1.0
+
+    @staticmethod
+    def test_principal_variation_search_searches_fewer_nodes():
+
+        # Act
+        nodes = count_nodes(NO_PRUNING._replace(principal_variation=True))
+
+        # Assert
+        assert nodes < count_nodes(NO_PRUNING)
+
+    @staticmethod
+    def test_null_move_pruning_searches_fewer_nodes():
+
+        # Act
+        nodes = count_nodes(NO_PRUNING._replace(null_move=True))
+
+        # Assert
+        assert nodes < count_nodes(NO_PRUNING)
+
+    @staticmethod
+    def test_late_move_reductions_search_fewer_nodes():
+
+        # Act
+        nodes = count_nodes(NO_PRUNING._replace(late_move_reductions=True))
+
+        # Assert
+        assert nodes < count_nodes(NO_PRUNING)
+
+    @staticmethod
+    def test_futility_pruning_searches_fewer_nodes():
+
+        # Act
+        nodes = count_nodes(NO_PRUNING._replace(futility=True))
+
+        # Assert
+        assert nodes < count_nodes(NO_PRUNING)
+
+    @staticmethod
+    def test_null_move_is_not_tried_with_only_pawns_left():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(0, 4), King(Player.WHITE))
+        board.set_piece(Square.at(1, 0), Pawn(Player.WHITE))
+        board.set_piece(Square.at(7, 4), King(Player.BLACK))
+        board.set_piece(Square.at(6, 7), Pawn(Player.BLACK))
+        null_moves = []
+        bot = Bot(options=NO_PRUNING._replace(null_move=True))
+        bot.make_null_move = lambda position: null_moves.append(position) or Bot.make_null_move(position)
+
+        # Act
+        bot.search(board, max_depth=5)
+
+        # Assert
+        assert board.has_non_pawn_material(Player.WHITE) is False
+        assert null_moves == []
+
+    @staticmethod
+    def test_pruning_still_captures_undefended_queen():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(0, 4), King(Player.WHITE))
+        board.set_piece(Square.at(7, 4), King(Player.BLACK))
+        board.set_piece(Square.at(3, 0), Rook(Player.WHITE))
+        board.set_piece(Square.at(3, 7), Queen(Player.BLACK))
+
+        # Act
+        result = Bot(options=SearchOptions()).search(board, max_depth=4)
+
+        # Assert
+        assert result.move == Move.between(Square.at(3, 0), Square.at(3, 7))
+
+    @staticmethod
+    def test_analysis_yields_the_best_lines_after_each_depth():
+
+        # Arrange
+        board = get_position('queens gambit')
+
+        # Act
+        analyses = list(Bot().analyse(board, lines=3, max_depth=3))
+
+        # Assert
+        assert [analysis.depth for analysis in analyses] == [1, 2, 3]
+        for analysis in analyses:
+            scores = [line.score for line in analysis.lines]
+            assert len(analysis.lines) == 3
+            assert scores == sorted(scores, reverse=True)
+            assert len({line.move for line in analysis.lines}) == 3
+            assert all(line.pv[0] == line.move for line in analysis.lines)
+        assert len(analyses[-1].lines[0].pv) > 1
+        assert analyses[-1].nodes > analyses[0].nodes
+
+    @staticmethod
+    def test_analysis_of_several_lines_costs_less_than_separate_searches():
+
+        # Arrange
+        board = get_position('queens gambit')
+
+        # Act
+        analysis = list(Bot().analyse(board, lines=3, max_depth=PRUNING_DEPTH))[-1]
+        single = Bot().search(board, max_depth=PRUNING_DEPTH)
+
+        # Assert
+        assert analysis.lines[0].score == single.score
+        assert analysis.nodes < 3 * single.nodes
+
+    @staticmethod
+    def test_analysis_can_be_streamed_asynchronously():
+
+        # Arrange
+        board = Board.at_starting_position()
+        time_manager = TimeManager()
+
+        async def stream():
+            depths = []
+            async for analysis in Bot().analyse_async(board, lines=2, time_manager=time_manager):
+                depths.append(analysis.depth)
+                if analysis.depth == 2:
+                    break
+            return depths
+
+        # Act
+        depths = asyncio.run(stream())
+
+        # Assert
+        assert depths == [1, 2]
+        assert time_manager.stop_event.is_set()
+
+    @staticmethod
+    def test_ponder_hit_carries_on_the_search_of_the_expected_reply():
+
+        # Arrange
+        board = get_position('queens gambit')
+        bot = Bot(max_depth=3)
+        ponderer = Ponderer(bot)
+        result = ponderer.search(board)
+        board.move_piece(result.move.from_square, result.move.to_square)
+        expected_move = ponderer.start(board)
+        ponderer.wait()
+        board.move_piece(expected_move.from_square, expected_move.to_square)
+        time_manager = TimeManager()
+        time_manager.cancel()
+
+        # Act
+        result = ponderer.search(board, time_manager)
+
+        # Assert
+        assert ponderer.hits == 1
+        assert result.move is not None
+        assert result.depth == 3
+        assert not result.aborted
+        assert not ponderer.is_pondering()
+
+    @staticmethod
+    def test_ponder_miss_abandons_the_search_but_keeps_its_table_entries():
+
+        # Arrange
+        board = get_position('queens gambit')
+        bot = Bot(max_depth=3)
+        ponderer = Ponderer(bot)
+        result = ponderer.search(board)
+        board.move_piece(result.move.from_square, result.move.to_square)
+        expected_move = ponderer.start(board)
+        pondered = board.clone()
+        pondered.move_piece(expected_move.from_square, expected_move.to_square)
+        ponderer.wait()
+        other_move = next(move for move in Bot.generate_legal_moves(board) if move != expected_move)
+        board.move_piece(other_move.from_square, other_move.to_square)
+
+        # Act
+        result = ponderer.search(board)
+
+        # Assert
+        assert ponderer.misses == 1
+        assert ponderer.hits == 0
+        assert result.move is not None
+        assert bot.table.probe(pondered.get_position_hash()) is not None
+
+    @staticmethod
+    def test_node_budget_stops_the_search():
+
+        # Arrange
+        time_manager = TimeManager(node_budget=500)
+
+        # Act
+        result = Bot().search(Board.at_starting_position(), time_manager)
+
+        # Assert
+        assert result.aborted
+        assert result.nodes < 500 + time_manager.check_interval
+
+    @staticmethod
+    def test_bot_gives_checkmate_rather_than_stalemate():
+
+        # Arrange
+        board = Board.from_fen('7k/5K2/8/6Q1/8/8/8/8 w - - 0 1')
+        bot = Bot()
+
+        # Act
+        result = bot.search(board, max_depth=2)
+
+        # Assert
+        assert result.score == MATE_SCORE - 1
+        child = board.clone()
+        child.move_piece(result.move.from_square, result.move.to_square)
+        assert child.is_in_check(Player.BLACK)
+
+    @staticmethod
+    def test_mates_found_by_an_earlier_search_keep_their_distance_from_the_new_root():
+
+        # Arrange
+        mate_in_one = Board.from_fen('7k/5K2/8/6Q1/8/8/8/8 w - - 0 1')
+        before_mate_in_one = Board.from_fen('8/5K1k/8/6Q1/8/8/8/8 b - - 0 1')
+        bot = Bot()
+        bot.search(mate_in_one, max_depth=3)
+
+        # Act
+        result = bot.search(before_mate_in_one, max_depth=3)
+
+        # Assert
+        assert result.score == -(MATE_SCORE - 2)
+        assert result.score == Bot().search(before_mate_in_one, max_depth=3).score
+
+    @staticmethod
+    def test_bot_has_no_move_in_stalemate():
+
+        # Arrange
+        board = Board.from_fen('7k/8/6Q1/8/8/8/8/K7 b - - 0 1')
+
+        # Act
+        result = Bot().search(board, max_depth=2)
+
+        # Assert
+        assert result.move is None
+        assert result.score == 0
+
+    @staticmethod
+    def test_bot_does_not_move_into_check():
+
+        # Arrange
+        board = Board.from_fen('8/8/8/8/8/2k5/3r4/4K3 w - - 0 1')
+
+        # Act
+        result = Bot().search(board, max_depth=1)
+
+        # Assert
+        assert result.move == Move.from_uci('e1f1')
@@ -0,0 +1,123 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from chessington.dataset import DatasetSettings, GameTask, ShardWriter, Sample, generate, load_shards, \
+    pack_board, play_moves, sample_game, unpack_boards  # noqa: E402
+from chessington.engine.batch import board_to_tensor  # noqa: E402
+from chessington.engine.board import Board  # noqa: E402
+from chessington.engine.bot import MATE_SCORE  # noqa: E402
+
+SETTINGS = DatasetSettings(depth=1, node_budget=None, play_depth=1, sample_rate=1.0, random_plies=4, max_plies=8)
+
+
+class TestDataset:
+
+    @staticmethod
+    def test_packed_boards_unpack_to_their_piece_planes():
+
+        # Arrange
+        board = Board.at_starting_position()
+
+        # Act
+        packed = pack_board(board)
+
+        # Assert
+        assert packed.shape == (12, 8)
+        assert (unpack_boards(packed) == board_to_tensor(board, dtype=np.uint8)).all()
+
+    @staticmethod
+    def test_replayed_game_is_sampled_at_every_ply():
+
+        # Arrange
+        task = GameTask(game_id=7, seed=0, moves=['e2e4', 'e7e5', 'g1f3'], result='1/2-1/2')
+
+        # Act
+        samples = sample_game(task, SETTINGS)
+
+        # Assert
+        assert [sample.ply for sample in samples] == [0, 1, 2, 3]
+        assert [sample.side_to_move for sample in samples] == [1, -1, 1, -1]
+        assert all(sample.game_id == 7 and sample.result == 0 for sample in samples)
+
+    @staticmethod
+    def test_positions_after_the_game_has_ended_are_not_sampled():
+
+        # Arrange
+        task = GameTask(game_id=0, seed=0, moves=['f2f3', 'e7e5', 'g2g4', 'd8h4'], result='0-1')
+
+        # Act
+        samples = sample_game(task, SETTINGS)
+
+        # Assert
+        assert [sample.ply for sample in samples] == [0, 1, 2, 3]
+        assert all(sample.result == -1 for sample in samples)
+
+    @staticmethod
+    def test_positions_are_still_scored_when_the_node_budget_runs_out_before_depth_one():
+
+        # Arrange
+        settings = SETTINGS._replace(depth=3, node_budget=1)
+        task = GameTask(game_id=0, seed=0, moves='e2e4 e7e5 d2d4 d7d5 g1f3 b8c6 f1c4 g8f6 b1c3 f8c5'.split(),
+                        result='1/2-1/2')
+
+        # Act
+        samples = sample_game(task, settings)
+
+        # Assert
+        assert len(samples) == 11
+        assert all(abs(sample.score) < MATE_SCORE for sample in samples)
+
+    @staticmethod
+    def test_random_opening_moves_never_leave_the_king_in_check():
+
+        # Arrange
+        settings = SETTINGS._replace(random_plies=60, max_plies=60)
+
+        for seed in range(5):
+
+            # Act
+            moves, _ = play_moves(settings, random.Random(seed))
+
+            # Assert
+            board = Board.at_starting_position()
+            for move in moves:
+                player = board.current_player
+                board.move_piece(move.from_square, move.to_square)
+                assert not board.is_in_check(player)
+
+    @staticmethod
+    def test_shards_have_a_fixed_size(tmp_path):
+
+        # Arrange
+        board = pack_board(Board.at_starting_position())
+        samples = [Sample(board=board, side_to_move=1, score=index, result=0, game_id=0, ply=index)
+                   for index in range(7)]
+
+        # Act
+        with ShardWriter(str(tmp_path), shard_size=3) as writer:
+            for sample in samples:
+                writer.write(sample)
+        shards = list(load_shards(str(tmp_path)))
+
+        # Assert
+        assert [len(shard['scores']) for shard in shards] == [3, 3, 1]
+        assert list(np.concatenate([shard['scores'] for shard in shards])) == list(range(7))
+
+    @staticmethod
+    def test_games_are_played_and_scored_across_workers(tmp_path):
+
+        # Arrange
+        tasks = (GameTask(game_id=game_id, seed=game_id, moves=None, result=None) for game_id in range(4))
+
+        # Act
+        total = generate(tasks, SETTINGS, str(tmp_path), shard_size=5, workers=2, queue_size=2)
+        shards = list(load_shards(str(tmp_path)))
+
+        # Assert
+        assert total == sum(len(shard['scores']) for shard in shards)
+        assert total >= 4
+        assert sorted(set(np.concatenate([shard['game_ids'] for shard in shards]))) == [0, 1, 2, 3]
+        assert shards[0]['boards'].shape == (5, 12, 8)
@@ -0,0 +1,97 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.move_cache import MoveCache
+from chessington.engine.pieces import Pawn, Queen
+
+
+class TestMoveCache:
+
+    @staticmethod
+    def test_cached_moves_match_available_moves():
+
+        # Arrange
+        board = Board.at_starting_position()
+        cache = MoveCache()
+        square = Square.at(0, 1)
+
+        # Act
+        moves = cache.get_available_moves(board, square)
+
+        # Assert
+        assert sorted(moves) == sorted(board.get_piece(square).get_available_moves(board))
+
+    @staticmethod
+    def test_repeated_lookup_of_a_position_is_a_hit():
+
+        # Arrange
+        cache = MoveCache()
+        cache.get_moves(Board.at_starting_position())
+
+        # Act
+        cache.get_moves(Board.at_starting_position())
+        stats = cache.stats()
+
+        # Assert
+        assert stats.hits == 1
+        assert stats.misses == 1
+        assert stats.hit_rate == 0.5
+
+    @staticmethod
+    def test_moving_a_piece_invalidates_cached_moves():
+
+        # Arrange
+        board = Board.at_starting_position()
+        cache = MoveCache()
+        cache.get_moves(board)
+
+        # Act
+        board.move_piece(Square.at(1, 4), Square.at(3, 4))
+        moves = cache.get_moves(board)
+
+        # Assert
+        assert Square.at(6, 4) in moves
+        assert Square.at(1, 4) not in moves
+        assert cache.stats().misses == 2
+
+    @staticmethod
+    def test_setting_a_piece_invalidates_cached_moves():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(3, 3), Pawn(Player.WHITE))
+        cache = MoveCache()
+        before = cache.get_available_moves(board, Square.at(3, 3))
+
+        # Act
+        board.set_piece(Square.at(3, 3), Queen(Player.WHITE))
+        after = cache.get_available_moves(board, Square.at(3, 3))
+
+        # Assert
+        assert len(before) == 1
+        assert len(after) == 27
+
+    @staticmethod
+    def test_least_recently_used_position_is_evicted():
+
+        # Arrange
+        cache = MoveCache(capacity=2)
+        first = Board.at_starting_position()
+        second = Board.at_starting_position()
+        second.move_piece(Square.at(1, 4), Square.at(3, 4))
+        third = Board.at_starting_position()
+        third.move_piece(Square.at(1, 3), Square.at(3, 3))
+        cache.get_moves(first)
+        cache.get_moves(second)
+        cache.get_moves(first)
+
+        # Act
+        cache.get_moves(third)
+        cache.get_moves(first)
+        cache.get_moves(second)
+        stats = cache.stats()
+
+        # Assert
+        assert stats.evictions == 2
+        assert stats.size == 2
+        assert stats.hits == 2
+        assert stats.misses == 4
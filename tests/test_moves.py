@@ -0,0 +1,95 @@
+from array import array
+
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square, Move
+from chessington.engine.moves import generate_moves, new_move_buffer, encode_move, decode_move, move_flags, \
+    CAPTURE, PROMOTION, SQUARES, perft
+from chessington.engine.pieces import Pawn
+from tests.helpers import play_random_games
+
+
+class TestMoves:
+
+    @staticmethod
+    def test_moves_are_packed_into_sixteen_bits():
+
+        # Act
+        move = encode_move(63, 62, CAPTURE | PROMOTION)
+
+        # Assert
+        assert 0 <= move < 1 << 16
+        assert decode_move(move) == Move.between(Square.at(7, 7), Square.at(7, 6))
+        assert move_flags(move) == CAPTURE | PROMOTION
+
+    @staticmethod
+    def test_there_are_twenty_moves_from_the_starting_position():
+
+        # Arrange
+        board = Board.at_starting_position()
+        buffer = new_move_buffer()
+
+        # Act
+        count = generate_moves(board, buffer)
+
+        # Assert
+        assert count == 20
+
+    @staticmethod
+    def test_overfilling_the_buffer_is_a_clear_error():
+
+        # Arrange
+        board = Board.at_starting_position()
+        buffer = array('H', bytes(2 * 10))
+
+        # Act / Assert
+        with pytest.raises(ValueError, match='more than the 10 moves'):
+            generate_moves(board, buffer)
+
+    @staticmethod
+    def test_pawn_moves_to_the_end_row_are_flagged_as_promotions():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.at(6, 0), Pawn(Player.WHITE))
+        buffer = new_move_buffer()
+
+        # Act
+        count = generate_moves(board, buffer)
+
+        # Assert
+        assert count == 1
+        assert move_flags(buffer[0]) == PROMOTION
+
+    @staticmethod
+    def test_generated_moves_match_the_moves_pieces_say_are_available():
+
+        # Arrange
+        buffer = new_move_buffer()
+
+        for board in play_random_games(games=1, plies=120):
+
+            # Act
+            count = generate_moves(board, buffer)
+            generated = sorted(decode_move(buffer[index]) for index in range(count))
+
+            # Assert
+            expected = []
+            for square in SQUARES:
+                piece = board.get_piece(square)
+                if piece is not None and piece.player == board.current_player:
+                    expected += [Move.between(square, to_square) for to_square in piece.get_available_moves(board)]
+            assert generated == sorted(expected)
+
+    @staticmethod
+    def test_perft_from_the_starting_position():
+
+        # Arrange
+        board = Board.at_starting_position()
+
+        # Act
+        counts = [perft(board, depth) for depth in range(1, 4)]
+
+        # Assert
+        assert counts == [20, 400, 8902]
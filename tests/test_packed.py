@@ -0,0 +1,83 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.packed import encode_board, decode_board, PositionStore, POSITION_SIZE, MAX_FULLMOVE_NUMBER
+from chessington.engine.pieces import Pawn, Queen
+
+
+class TestPackedPositions:
+
+    @staticmethod
+    def test_positions_are_packed_into_at_most_forty_bytes():
+
+        # Act
+        data = encode_board(Board.at_starting_position())
+
+        # Assert
+        assert len(data) == POSITION_SIZE
+        assert 32 <= POSITION_SIZE <= 40
+
+    @staticmethod
+    def test_packed_positions_can_be_unpacked():
+
+        # Arrange
+        board = Board.at_starting_position()
+        board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+        # Act
+        unpacked = decode_board(encode_board(board))
+
+        # Assert
+        assert isinstance(unpacked.get_piece(Square.at(3, 4)), Pawn)
+        assert unpacked.get_piece(Square.at(1, 4)) is None
+        assert unpacked.get_piece(Square.at(7, 3)).player == Player.BLACK
+        assert unpacked.current_player == Player.BLACK
+        assert unpacked.en_passant_state == Square.at(3, 4)
+        assert encode_board(unpacked) == encode_board(board)
+
+    @staticmethod
+    def test_move_counters_too_large_to_store_are_clamped():
+
+        # Arrange
+        board = Board.from_fen('4k3/8/8/8/8/8/8/4K3 w - - 300 70000')
+
+        # Act
+        unpacked = decode_board(encode_board(board))
+
+        # Assert
+        assert unpacked.halfmove_clock == 255
+        assert unpacked.fullmove_number == MAX_FULLMOVE_NUMBER
+
+    @staticmethod
+    def test_stored_positions_can_be_read_back_by_index(tmp_path):
+
+        # Arrange
+        first = Board.at_starting_position()
+        second = Board.empty()
+        second.set_piece(Square.at(4, 4), Queen(Player.BLACK))
+
+        # Act
+        with PositionStore(str(tmp_path / 'positions.bin')) as store:
+            store.append(first)
+            index = store.append(second)
+            read_back = store[index]
+            count = len(store)
+
+        # Assert
+        assert index == 1
+        assert count == 2
+        assert isinstance(read_back.get_piece(Square.at(4, 4)), Queen)
+
+    @staticmethod
+    def test_stores_can_be_reopened(tmp_path):
+
+        # Arrange
+        path = str(tmp_path / 'positions.bin')
+        with PositionStore(path) as store:
+            store.extend([Board.empty(), Board.at_starting_position()])
+
+        # Act
+        with PositionStore(path) as store:
+            read_back = store[-1]
+
+        # Assert
+        assert encode_board(read_back) == encode_board(Board.at_starting_position())
@@ -0,0 +1,55 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.position_index import build_index, PositionIndex, GamePosition
+
+
+class TestPositionIndex:
+
+    @staticmethod
+    def test_games_reaching_a_position_are_found(tmp_path):
+
+        # Arrange
+        path = str(tmp_path / 'positions.idx')
+        games = [
+            (1, ['g1f3', 'g8f6', 'b1c3']),
+            (2, ['b1c3', 'g8f6', 'g1f3']),
+            (3, ['d2d4', 'd7d5'])
+        ]
+        build_index(games, path, chunk_size=3, temp_dir=str(tmp_path))
+        board = Board.at_starting_position()
+        board.move_piece(Square.at(1, 4), Square.at(2, 4))
+
+        # Act
+        with PositionIndex(path) as index:
+            after_e3 = index.lookup(board)
+            after_nc3 = index.lookup(index_hash_after(['g1f3', 'g8f6', 'b1c3']))
+            length = len(index)
+
+        # Assert
+        assert after_e3 == []
+        assert sorted(after_nc3) == [GamePosition(game_id=1, ply=3), GamePosition(game_id=2, ply=3)]
+        assert length == 11
+
+    @staticmethod
+    def test_many_positions_can_be_looked_up_at_once(tmp_path):
+
+        # Arrange
+        path = str(tmp_path / 'positions.idx')
+        build_index([(7, ['e2e4']), (8, ['d2d4'])], path, temp_dir=str(tmp_path))
+        start = Board.at_starting_position().get_position_hash()
+        after_d4 = index_hash_after(['d2d4'])
+
+        # Act
+        with PositionIndex(path) as index:
+            results = index.lookup_many([after_d4, start])
+
+        # Assert
+        assert sorted(results[start]) == [GamePosition(game_id=7, ply=0), GamePosition(game_id=8, ply=0)]
+        assert results[after_d4] == [GamePosition(game_id=8, ply=1)]
+
+
+def index_hash_after(moves):
+    board = Board.at_starting_position()
+    for move in moves:
+        board.move_piece(Square.from_algebraic(move[0:2]), Square.from_algebraic(move[2:4]))
+    return board.get_position_hash()
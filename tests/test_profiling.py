@@ -0,0 +1,64 @@
+import json
+
+from chessington.engine import profiling
+from chessington.engine.board import Board
+from chessington.engine.bot import Bot
+from chessington.engine.data import Square
+from chessington.engine.pieces import Knight
+
+
+class TestProfiling:
+
+    @staticmethod
+    def test_profiling_counts_calls_to_engine_entry_points():
+
+        # Arrange
+        board = Board.at_starting_position()
+        profiler = profiling.enable()
+
+        # Act
+        try:
+            board.get_piece(Square.at(0, 1)).get_available_moves(board)
+            Bot().search(board, max_depth=2)
+        finally:
+            profiling.disable()
+
+        # Assert
+        assert profiler.calls['Knight.get_available_moves'] == 1
+        assert profiler.calls['Bot.search'] == 1
+        assert profiler.calls['Board.move_piece'] > 20
+        assert profiler.total_ns['Bot.search'] >= profiler.total_ns['Board.move_piece']
+
+    @staticmethod
+    def test_disabling_profiling_restores_the_engine():
+
+        # Arrange
+        original = Knight.__dict__['get_available_moves']
+        profiling.enable()
+
+        # Act
+        profiling.disable()
+
+        # Assert
+        assert Knight.__dict__['get_available_moves'] is original
+
+    @staticmethod
+    def test_results_are_written_as_json_and_collapsed_stacks(tmp_path):
+
+        # Arrange
+        profiler = profiling.enable(capture=profiling.CPROFILE, output_dir=str(tmp_path))
+        try:
+            Bot().search(Board.at_starting_position(), max_depth=1)
+        finally:
+            profiling.disable()
+
+        # Act
+        profiler.dump()
+
+        # Assert
+        with open(str(tmp_path / 'chessington-profile.json')) as json_file:
+            assert json.load(json_file)['Bot.search']['calls'] == 1
+        with open(str(tmp_path / 'chessington-profile.collapsed')) as collapsed_file:
+            lines = collapsed_file.read().splitlines()
+        assert any(line.startswith('Bot.search;Board.move_piece ') for line in lines)
+        assert (tmp_path / 'search-1.prof').exists()
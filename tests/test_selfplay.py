@@ -0,0 +1,147 @@
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Move, Player, Square
+from chessington.engine.notation import to_san
+from chessington.engine.pieces import Knight, Pawn
+from chessington.selfplay import GameSettings, TimeControl, get_result, play_game, read_openings, to_pgn
+
+
+class TestNotation:
+
+    @staticmethod
+    def test_moves_can_be_read_from_long_algebraic_notation():
+
+        # Act
+        move = Move.from_uci('g1f3')
+
+        # Assert
+        assert move == Move.between(Square.at(0, 6), Square.at(2, 5))
+        assert move.to_uci() == 'g1f3'
+
+    @staticmethod
+    def test_pawn_captures_are_written_with_the_file_they_left():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.from_algebraic('e4'), Pawn(Player.WHITE))
+        board.set_piece(Square.from_algebraic('d5'), Pawn(Player.BLACK))
+
+        # Act
+        san = to_san(board, Move.from_uci('e4d5'))
+
+        # Assert
+        assert san == 'exd5'
+
+    @staticmethod
+    def test_ambiguous_moves_are_disambiguated_by_file():
+
+        # Arrange
+        board = Board.empty()
+        board.set_piece(Square.from_algebraic('b1'), Knight(Player.WHITE))
+        board.set_piece(Square.from_algebraic('f1'), Knight(Player.WHITE))
+
+        # Act
+        san = to_san(board, Move.from_uci('b1d2'))
+
+        # Assert
+        assert san == 'Nbd2'
+
+
+class TestSelfPlay:
+
+    @staticmethod
+    def test_time_controls_can_be_parsed():
+
+        # Act
+        time_control = TimeControl.parse('60+0.5')
+
+        # Assert
+        assert time_control == TimeControl(base=60.0, increment=0.5)
+
+    @staticmethod
+    def test_games_record_timing_and_nodes_for_every_move():
+
+        # Arrange
+        settings = GameSettings(game_id=0, opening=['e2e4', 'e7e5'], time_control=TimeControl(base=10, increment=0),
+                                max_depth=1, max_plies=6)
+
+        # Act
+        record = play_game(settings)
+
+        # Assert
+        assert record['result'] == '1/2-1/2'
+        assert len(record['moves']) == 6
+        assert all('nodes' in move and 'time' in move for move in record['moves'][2:])
+
+    @staticmethod
+    def test_games_end_at_checkmate():
+
+        # Arrange
+        settings = GameSettings(game_id=0, opening=['f2f3', 'e7e5', 'g2g4', 'd8h4'],
+                                time_control=TimeControl(base=10, increment=0), max_depth=1, max_plies=20)
+
+        # Act
+        record = play_game(settings)
+
+        # Assert
+        assert record['result'] == '0-1'
+        assert record['termination'] == 'normal'
+        assert len(record['moves']) == 4
+
+    @staticmethod
+    def test_a_move_made_after_the_clock_runs_out_is_not_played():
+
+        # Arrange
+        settings = GameSettings(game_id=0, opening=['e2e4'], time_control=TimeControl(base=0, increment=0),
+                                max_depth=1, max_plies=20)
+
+        # Act
+        record = play_game(settings)
+
+        # Assert
+        assert record['result'] == '1-0'
+        assert record['termination'] == 'time forfeit'
+        assert [move['uci'] for move in record['moves']] == ['e2e4']
+
+    @staticmethod
+    def test_openings_with_an_illegal_move_are_rejected(tmp_path):
+
+        # Arrange
+        path = tmp_path / 'openings.txt'
+        path.write_text('# Openings\ne2e4 e7e5\n\ne2e4 e1e2 e7e5\n')
+
+        # Act
+        with pytest.raises(ValueError) as error:
+            read_openings(str(path))
+
+        # Assert
+        assert 'line 4' in str(error.value)
+        assert 'e1e2' in str(error.value)
+
+    @staticmethod
+    def test_checkmate_is_won_by_the_side_not_to_move_and_stalemate_is_drawn():
+
+        # Arrange
+        checkmate = Board.from_fen('R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1')
+        stalemate = Board.from_fen('7k/8/6Q1/8/8/8/8/K7 b - - 0 1')
+
+        # Act
+        results = [get_result(board, board.game_state()) for board in (checkmate, stalemate)]
+
+        # Assert
+        assert results == ['1-0', '1/2-1/2']
+
+    @staticmethod
+    def test_games_are_written_as_pgn():
+
+        # Arrange
+        record = {'game_id': 0, 'time_control': '10+0', 'result': '1-0', 'termination': 'normal',
+                  'moves': [{'san': 'e4', 'book': True}, {'san': 'e5', 'time': 0.5, 'nodes': 100}]}
+
+        # Act
+        pgn = to_pgn(record)
+
+        # Assert
+        assert '[Result "1-0"]' in pgn
+        assert '1. e4 e5 {0.500s 100 nodes} 1-0' in pgn
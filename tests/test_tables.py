@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+from chessington.engine.tables import lazy_table
+
+
+class TestTables:
+
+    @staticmethod
+    def test_lazy_table_is_built_once_on_first_use():
+
+        # Arrange
+        builds = []
+
+        @lazy_table
+        def get_table():
+            builds.append(1)
+            return [1, 2, 3]
+
+        # Act
+        first = get_table()
+        second = get_table()
+
+        # Assert
+        assert first == [1, 2, 3]
+        assert second is first
+        assert len(builds) == 1
+
+    @staticmethod
+    def test_importing_the_engine_does_not_import_the_gui():
+
+        # Arrange
+        script = '; '.join([
+            'import sys',
+            'import chessington.ui',
+            'from chessington.engine import Board, Bot',
+            'import chessington.engine.moves, chessington.engine.notation, chessington.selfplay',
+            'print(sorted(name for name in ("PySimpleGUI", "tkinter", "asyncio") if name in sys.modules))',
+        ])
+
+        # Act
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=os.path.dirname(os.path.dirname(__file__)))
+
+        # Assert
+        assert output.decode().strip() == '[]'
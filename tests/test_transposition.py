@@ -0,0 +1,113 @@
+import multiprocessing
+
+from chessington.engine.board import Board
+from chessington.engine.bot import Bot, MATE_SCORE
+from chessington.engine.transposition import TranspositionTable, TableEntry, ENTRY_FORMAT, EXACT, LOWER_BOUND
+
+
+def store_entry(table_name, entries, key):
+    table = TranspositionTable.attach(table_name, entries)
+    table.store(key, move=123, score=-45, depth=6, bound=LOWER_BOUND)
+    table.close()
+
+
+class TestTranspositionTable:
+
+    @staticmethod
+    def test_stored_results_can_be_probed():
+
+        # Arrange
+        table = TranspositionTable(entries=1024)
+
+        # Act
+        table.store(0xDEADBEEF12345678, move=4321, score=-250, depth=5, bound=EXACT)
+
+        # Assert
+        assert table.probe(0xDEADBEEF12345678) == TableEntry(move=4321, score=-250, depth=5, bound=EXACT)
+        assert table.probe(0x1EADBEEF12345678) is None
+
+    @staticmethod
+    def test_torn_entries_are_ignored():
+
+        # Arrange
+        table = TranspositionTable(entries=1024)
+        key = 0xDEADBEEF12345678
+        table.store(key, move=4321, score=-250, depth=5, bound=EXACT)
+
+        # Act
+        offset = (key & table.mask) * ENTRY_FORMAT.size
+        checked_key, data = ENTRY_FORMAT.unpack_from(table.buffer, offset)
+        ENTRY_FORMAT.pack_into(table.buffer, offset, checked_key, data ^ 1)
+
+        # Assert
+        assert table.probe(key) is None
+
+    @staticmethod
+    def test_deeper_results_are_not_replaced_by_shallower_ones():
+
+        # Arrange
+        table = TranspositionTable(entries=1024)
+        table.store(99, move=1, score=10, depth=8, bound=EXACT)
+
+        # Act
+        table.store(99, move=2, score=20, depth=3, bound=EXACT)
+
+        # Assert
+        assert table.probe(99).move == 1
+
+    @staticmethod
+    def test_shared_tables_are_visible_to_other_processes():
+
+        # Arrange
+        table = TranspositionTable.create_shared(entries=1024)
+
+        # Act
+        process = multiprocessing.Process(target=store_entry, args=(table.name, table.entries, 77))
+        process.start()
+        process.join()
+
+        # Assert
+        try:
+            assert table.probe(77) == TableEntry(move=123, score=-45, depth=6, bound=LOWER_BOUND)
+        finally:
+            table.close(unlink=True)
+
+
+class TestLazySmp:
+
+    @staticmethod
+    def test_bot_with_helper_processes_finds_a_move():
+
+        # Arrange
+        bot = Bot(helpers=2)
+
+        # Act
+        try:
+            result = bot.search(Board.at_starting_position(), max_depth=3)
+        finally:
+            bot.close()
+
+        # Assert
+        assert result.move is not None
+        assert result.depth == 3
+
+    @staticmethod
+    def test_helper_processes_are_reused_by_later_searches():
+
+        # Arrange
+        bot = Bot(helpers=2)
+
+        # Act
+        try:
+            bot.search(Board.at_starting_position(), max_depth=2)
+            first_pids = [process.pid for process in bot._helper_pool.processes]
+            result = bot.search(Board.from_fen('7k/5K2/8/6Q1/8/8/8/8 w - - 0 1'), max_depth=2)
+            second_pids = [process.pid for process in bot._helper_pool.processes]
+            alive = all(process.is_alive() for process in bot._helper_pool.processes)
+        finally:
+            bot.close()
+
+        # Assert
+        assert first_pids == second_pids
+        assert alive
+        assert result.score == MATE_SCORE - 1
@@ -0,0 +1,222 @@
+import io
+import threading
+
+from chessington.engine.bot import Bot, TimeManager, MATE_SCORE
+from chessington.uci import UciEngine, format_score, parse_go
+
+
+# How long to wait for a search running on the engine's search thread to report, before failing the test
+SEARCH_TIMEOUT = 30
+
+
+def get_replies(output):
+    return output.getvalue().splitlines()
+
+
+class SearchOutput(io.StringIO):
+    """
+    Output which signals `searching` once the engine has reported on a search, so that tests can wait until a search
+    is under way.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.searching = threading.Event()
+
+    def write(self, text):
+        if text.startswith('info depth '):
+            self.searching.set()
+        return super().write(text)
+
+
+class TestUci:
+
+    @staticmethod
+    def test_uci_command_identifies_the_engine():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+
+        # Act
+        engine.handle('uci')
+        engine.handle('isready')
+
+        # Assert
+        replies = get_replies(output)
+        assert replies[0].startswith('id name ')
+        assert replies[-2:] == ['uciok', 'readyok']
+
+    @staticmethod
+    def test_go_parameters_are_parsed():
+
+        # Act
+        parameters = parse_go('wtime 1000 btime 2000 winc 10 movestogo 5 ponder'.split())
+
+        # Assert
+        assert parameters == {'wtime': 1000, 'btime': 2000, 'winc': 10, 'movestogo': 5, 'ponder': True}
+
+    @staticmethod
+    def test_mate_scores_are_written_in_moves():
+
+        # Act
+        texts = [format_score(score) for score in (35, MATE_SCORE - 1, MATE_SCORE - 3, -(MATE_SCORE - 2))]
+
+        # Assert
+        assert texts == ['cp 35', 'mate 1', 'mate 2', 'mate -1']
+
+    @staticmethod
+    def test_go_to_a_depth_reports_info_and_a_best_move():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+        engine.handle('position startpos moves e2e4 e7e5')
+
+        # Act
+        engine.handle('go depth 2')
+        engine.wait()
+
+        # Assert
+        replies = get_replies(output)
+        assert replies[0].startswith('info depth 1 multipv 1 score cp ')
+        assert replies[1].startswith('info depth 2 ')
+        assert replies[-1].startswith('bestmove ')
+
+    @staticmethod
+    def test_position_can_be_set_from_fen_and_promotions_are_written():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+        engine.handle('position fen 4k3/P7/8/8/8/8/8/4K3 w - - 0 1')
+
+        # Act
+        engine.handle('go depth 1')
+        engine.wait()
+
+        # Assert
+        assert get_replies(output)[-1] == 'bestmove a7a8q'
+
+    @staticmethod
+    def test_stop_interrupts_an_infinite_search():
+
+        # Arrange
+        output = SearchOutput()
+        engine = UciEngine(output)
+        engine.handle('go infinite')
+        assert output.searching.wait(SEARCH_TIMEOUT)
+        assert not any(reply.startswith('bestmove') for reply in get_replies(output))
+
+        # Act
+        engine.handle('stop')
+
+        # Assert
+        assert get_replies(output)[-1].startswith('bestmove ')
+        assert engine.bot.depth < engine.bot.max_depth
+
+    @staticmethod
+    def test_ponder_search_waits_for_ponderhit_then_uses_the_clock():
+
+        # Arrange
+        output = SearchOutput()
+        engine = UciEngine(output)
+        engine.handle('go ponder wtime 3000 btime 3000')
+        assert output.searching.wait(SEARCH_TIMEOUT)
+        assert not any(reply.startswith('bestmove') for reply in get_replies(output))
+
+        # Act
+        engine.handle('ponderhit')
+        engine.wait()
+
+        # Assert
+        assert get_replies(output)[-1].startswith('bestmove ')
+
+    @staticmethod
+    def test_multipv_option_reports_several_lines():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+        engine.handle('setoption name MultiPV value 3')
+
+        # Act
+        engine.handle('go depth 1')
+        engine.wait()
+
+        # Assert
+        assert [reply.split()[4] for reply in get_replies(output)[:3]] == ['1', '2', '3']
+
+    @staticmethod
+    def test_malformed_commands_are_reported_and_the_engine_carries_on():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+        engine.handle('position startpos moves e2e4')
+
+        # Act
+        engine.handle('position fen not/a/fen w')
+        engine.handle('position startpos moves e2e4 e7e9')
+        engine.handle('go wtime abc')
+        engine.handle('setoption name MultiPV value many')
+        engine.handle('isready')
+
+        # Assert
+        replies = get_replies(output)
+        assert len([reply for reply in replies if reply.startswith('info string ')]) == 4
+        assert replies[-1] == 'readyok'
+        assert engine.board.to_fen() == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - e3 0 1'
+        assert engine.lines == 1
+
+    @staticmethod
+    def test_a_move_leaving_the_king_in_check_is_rejected():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+        engine.handle('position fen 4r2k/8/8/8/q7/2N5/8/4K3 w - - 0 1')
+
+        # Act
+        engine.handle('position fen 4r2k/8/8/8/q7/2N5/8/4K3 w - - 0 1 moves c3a4')
+
+        # Assert
+        assert get_replies(output)[-1].startswith('info string ')
+        assert engine.board.to_fen() == '4r2k/8/8/8/q7/2N5/8/4K3 w - - 0 1'
+
+    @staticmethod
+    def test_checkmated_and_stalemated_players_have_no_best_move():
+
+        # Arrange
+        replies = []
+        for fen in ('R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1', '7k/8/6Q1/8/8/8/8/K7 b - - 0 1'):
+            output = io.StringIO()
+            engine = UciEngine(output)
+            engine.handle('position fen ' + fen)
+
+            # Act
+            engine.handle('go depth 3')
+            engine.wait()
+            replies.append(get_replies(output)[-1])
+
+        # Assert
+        assert replies == ['bestmove 0000', 'bestmove 0000']
+
+    @staticmethod
+    def test_a_search_stopped_before_the_first_depth_plays_a_legal_move():
+
+        # Arrange
+        output = io.StringIO()
+        engine = UciEngine(output)
+        engine.handle('position fen 4r2k/8/8/8/q7/2N5/8/4K3 w - - 0 1')
+        time_manager = TimeManager(check_interval=1)
+        time_manager.cancel()
+        engine._release.set()
+
+        # Act
+        engine._search(engine.board, time_manager, 3)
+
+        # Assert
+        legal_moves = [move.to_uci() for move in Bot.generate_legal_moves(engine.board)]
+        assert Bot.generate_moves(engine.board)[0].to_uci() == 'c3a4'
+        assert get_replies(output) == ['bestmove {}'.format(legal_moves[0])]